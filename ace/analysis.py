@@ -19,6 +19,7 @@ from dataclasses import dataclass, field, asdict
 from typing import Union, Optional, Any
 
 import ace
+import ace.time
 
 # import ace.system
 
@@ -34,9 +35,6 @@ from ace.data_model import (
 from ace.logging import get_logger
 from ace.time import parse_datetime_string, utc_now
 
-import pytz
-import tzlocal
-
 
 #
 # MERGING
@@ -353,12 +351,19 @@ class AnalysisModuleType:
 
     def version_matches(self, amt) -> bool:
         """Returns True if the given amt is the same version as this amt."""
+        # the registered type is often compared against itself
+        if amt is self:
+            return True
+
         return self.name == amt.name and self.version == amt.version
         # XXX should probably check the other fields as well
 
     def extended_version_matches(self, amt) -> bool:
         """Returns True if the given amt is the same version as this amt."""
-        return self.name == amt.name and self.version == amt.version and self.extended_version == amt.extended_version
+        if amt is self:
+            return True
+
+        return self.version_matches(amt) and self.extended_version == amt.extended_version
 
     async def accepts(self, observable: Observable, system: "ace.system.ACESystem") -> bool:
         assert isinstance(observable, Observable)
@@ -1008,10 +1013,10 @@ class Observable(TaggableObject, DetectableObject, MergableObject):
         elif isinstance(value, datetime.datetime):
             # if we didn't specify a timezone then we use the timezone of the local system
             if value.tzinfo is None:
-                value = value.replace(tzinfo=tzlocal.get_localzone())
+                value = value.replace(tzinfo=ace.time.LOCAL_TIMEZONE)
 
             # always convert to utc
-            self._time = value.astimezone(pytz.utc)
+            self._time = value.astimezone(datetime.timezone.utc)
         elif isinstance(value, str):
             self._time = parse_datetime_string(value)
         else:
@@ -1876,9 +1881,9 @@ class RootAnalysis(Analysis, MergableObject):
         elif isinstance(value, datetime.datetime):
             # if we didn't specify a timezone then we use the timezone of the local system
             if value.tzinfo is None:
-                value = value.replace(tzinfo=tzlocal.get_localzone())
+                value = value.replace(tzinfo=ace.time.LOCAL_TIMEZONE)
             # always convert to utc
-            self._event_time = value.astimezone(pytz.utc)
+            self._event_time = value.astimezone(datetime.timezone.utc)
         elif isinstance(value, str):
             self._event_time = parse_datetime_string(value)
         else:
@@ -235,6 +235,17 @@ class AceAPI:
         amt: Union[AnalysisModuleType, str],
         timeout: Optional[int] = 0,
         version: Optional[str] = None,
-        extended_version: Optional[dict[str, str]] = [],
+        extended_version: Optional[dict[str, str]] = None,
     ) -> Union[AnalysisRequest, None]:
         raise NotImplementedError()
+
+    async def get_next_analysis_requests(
+        self,
+        owner_uuid: str,
+        amt: Union[AnalysisModuleType, str],
+        count: int,
+        timeout: Optional[int] = 0,
+        version: Optional[str] = None,
+        extended_version: Optional[dict[str, str]] = None,
+    ) -> list[AnalysisRequest]:
+        raise NotImplementedError()
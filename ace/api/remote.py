@@ -1,6 +1,7 @@
 # vim: ts=4:sw=4:et:cc=120
 #
 
+import asyncio
 import contextlib
 import io
 import json
@@ -16,6 +17,7 @@ from ace.data_model import (
     ApiKeyListModel,
     AlertListModel,
     AnalysisRequestQueryModel,
+    AnalysisRequestBatchQueryModel,
     ConfigurationSetting,
     ContentMetadata,
     CustomJSONEncoder,
@@ -23,7 +25,7 @@ from ace.data_model import (
     Event,
 )
 from ace.analysis import RootAnalysis, AnalysisModuleType, Observable
-from ace.api import ApiKey
+from ace.api.apikey import ApiKey
 from ace.api.base import AceAPI
 from ace.logging import get_logger
 from ace.system import ACESystem
@@ -84,16 +86,52 @@ class RemoteAceAPI(AceAPI):
         if "base_url" not in self.client_kwargs:
             self.client_kwargs["base_url"] = url
 
-    def get_client(self):
-        kwargs = {}
-        kwargs.update(self.client_kwargs)
-        if self.api_key:
-            if "headers" not in kwargs:
-                kwargs["headers"] = {}
-
-            kwargs["headers"].update({"X-API-Key": self.api_key})
-
-        return AsyncClient(*self.client_args, **kwargs)
+        # the client is reused across calls so that connections (and the transport) are not rebuilt every time
+        self.client = None
+        # the api key and event loop the client was created for
+        self.client_api_key = None
+        self.client_loop = None
+        # guards (re)creating the client so concurrent calls do not each build (and leak) their own
+        self.client_lock = None
+        self.client_lock_loop = None
+
+    def _get_client_lock(self, loop: asyncio.AbstractEventLoop) -> asyncio.Lock:
+        # an asyncio.Lock is bound to the loop it is first used in so each loop gets its own
+        if self.client_lock is None or self.client_lock_loop is not loop:
+            self.client_lock = asyncio.Lock()
+            self.client_lock_loop = loop
+
+        return self.client_lock
+
+    @contextlib.asynccontextmanager
+    async def get_client(self):
+        loop = asyncio.get_running_loop()
+        async with self._get_client_lock(loop):
+            if self.client is None or self.client_api_key != self.api_key or self.client_loop is not loop:
+                # the old client can only be closed from the loop it was created in
+                if self.client is not None and self.client_loop is loop:
+                    await self.client.aclose()
+
+                kwargs = {}
+                kwargs.update(self.client_kwargs)
+                if self.api_key:
+                    kwargs["headers"] = dict(kwargs.get("headers", {}))
+                    kwargs["headers"].update({"X-API-Key": self.api_key})
+
+                self.client = AsyncClient(*self.client_args, **kwargs)
+                self.client_api_key = self.api_key
+                self.client_loop = loop
+
+            client = self.client
+
+        yield client
+
+    async def close(self):
+        """Closes the client used to connect to the remote service."""
+        async with self._get_client_lock(asyncio.get_running_loop()):
+            if self.client is not None:
+                await self.client.aclose()
+                self.client = None
 
     # alerting
     async def register_alert_system(self, name: str) -> bool:
@@ -456,7 +494,7 @@ class RemoteAceAPI(AceAPI):
         amt: Union[AnalysisModuleType, str],
         timeout: Optional[int] = 0,
         version: Optional[str] = None,
-        extended_version: Optional[dict[str, str]] = [],
+        extended_version: Optional[dict[str, str]] = None,
     ) -> Union[AnalysisRequest, None]:
         if isinstance(amt, AnalysisModuleType):
             version = amt.version
@@ -482,6 +520,36 @@ class RemoteAceAPI(AceAPI):
         else:
             return AnalysisRequest.from_dict(response.json(), self.system)
 
+    async def get_next_analysis_requests(
+        self,
+        owner_uuid: str,
+        amt: Union[AnalysisModuleType, str],
+        count: int,
+        timeout: Optional[int] = 0,
+        version: Optional[str] = None,
+        extended_version: Optional[dict[str, str]] = None,
+    ) -> list[AnalysisRequest]:
+        if isinstance(amt, AnalysisModuleType):
+            version = amt.version
+            extended_version = amt.extended_version
+            amt = amt.name
+
+        async with self.get_client() as client:
+            response = await client.post(
+                "/work_queue/batch",
+                json=AnalysisRequestBatchQueryModel(
+                    owner=owner_uuid,
+                    amt=amt,
+                    timeout=timeout,
+                    version=version,
+                    extended_version=extended_version,
+                    count=count,
+                ).dict(),
+            )
+
+        _raise_exception_on_error(response)
+        return [AnalysisRequest.from_dict(_, self.system) for _ in response.json()["analysis_requests"]]
+
     #
     # authentication
     #
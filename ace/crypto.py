@@ -23,6 +23,9 @@ import aiofiles
 
 CHUNK_SIZE = 64 * 1024
 
+# the number of PBKDF2 iterations used for new encryption settings
+DEFAULT_ITERATIONS = 8192
+
 ENV_CRYPTO_VERIFICATION_KEY = "ACE_CRYPTO_VERIFICATION_KEY"
 ENV_CRYPTO_SALT = "ACE_CRYPTO_SALT"
 ENV_CRYPTO_SALT_SIZE = "ACE_CRYPTO_SALT_SIZE"
@@ -140,7 +143,7 @@ async def initialize_encryption_settings(
         settings.salt = Crypto.Random.get_random_bytes(settings.salt_size)
 
     if settings.iterations is None:
-        settings.iterations = 8192
+        settings.iterations = DEFAULT_ITERATIONS
 
     result = PBKDF2(password, settings.salt, 64, settings.iterations)
     user_encryption_key = result[:32]  # the first 32 bytes is the user encryption key
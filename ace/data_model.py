@@ -368,11 +368,21 @@ class AnalysisRequestQueryModel(BaseModel):
         description="The current version of the analysis module type. This value must match what is registered."
     )
     extended_version: Optional[dict[str, str]] = Field(
-        [],
+        {},
         description="The optional extended version of the analysis module type. This value must match was is registered if it is used.",
     )
 
 
+class AnalysisRequestBatchQueryModel(AnalysisRequestQueryModel):
+    count: int = Field(description="The maximum number of analysis requests to return.")
+
+
+class AnalysisRequestListModel(BaseModel):
+    analysis_requests: list[AnalysisRequestModel] = Field(
+        [], description="The analysis requests assigned to the owner, in queue order."
+    )
+
+
 class AlertListModel(BaseModel):
     root_uuids: list[str]
 
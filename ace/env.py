@@ -37,6 +37,7 @@ class ACEOperatingEnvironment:
 
         # parse again to get the full set of options from loaded packages
         self.args = parser.parse_args(args=remaining_arguments, namespace=self.args)
+        self.parser = parser
 
     def initialize_argparse(self):
         """Parses the arguments passed at startup."""
@@ -29,5 +29,9 @@ def initialize_logging(logging_config_path: Optional[str] = None):
     # logging.getLogger('sqlalchemy.orm').setLevel(logging.DEBUG)
 
 
+# loggers are never removed once created so we only need to look this one up once
+_logger = logging.getLogger("ace")
+
+
 def get_logger():
-    return logging.getLogger("ace")
+    return _logger
@@ -205,6 +205,7 @@ class AnalysisModuleService(ACEService):
         await self.shutdown_event.wait()
         manager.stop()
         await task
+        await manager.system.stop()
 
 
 class AnalysisModuleManager:
@@ -265,6 +266,9 @@ class AnalysisModuleManager:
         # set right before entering processing loop
         self.event_loop_starting_event = asyncio.Event()
 
+        # set when the primary loop needs to wake up (new tasks or a forced stop)
+        self.module_tasks_changed_event = asyncio.Event()
+
         #
         # state flags
         #
@@ -284,7 +288,7 @@ class AnalysisModuleManager:
                 result = await self.system.get_analysis_module_type(module.type.name)
                 return module, result
 
-            task = asyncio.get_event_loop().create_task(check_type(module))
+            task = asyncio.create_task(check_type(module))
             tasks.append(task)
 
         verification_ok = True
@@ -346,6 +350,7 @@ class AnalysisModuleManager:
         # adds a new analysis module task to the event loop
         task = asyncio.create_task(self.module_loop(module, whoami), name=f"module {module.type.name}:{whoami}")
         self.module_tasks.append(task)
+        self.module_tasks_changed_event.set()
 
     def initialize_module_tasks(self):
         """Creates the initial set of analysis module tasks, one for each loaded analysis module."""
@@ -421,8 +426,16 @@ class AnalysisModuleManager:
         module_tasks = self.module_tasks[:]
         self.module_tasks = []
         while module_tasks:
-            # done, pending = await asyncio.wait(module_tasks, timeout=0.1, return_when=asyncio.FIRST_COMPLETED)
-            done, pending = await asyncio.wait(module_tasks, timeout=0.01)
+            # wait until a task completes, a new task is created or the manager is forced to stop
+            self.module_tasks_changed_event.clear()
+            changed = asyncio.create_task(self.module_tasks_changed_event.wait())
+            done, pending = await asyncio.wait(module_tasks + [changed], return_when=asyncio.FIRST_COMPLETED)
+            if changed in done:
+                done.remove(changed)
+            else:
+                changed.cancel()
+                pending.remove(changed)
+
             # if the system is shutting down then we go ahead and cancel any new and/or pending tasks
             if self.immediate_shutdown:
                 for task in pending:
@@ -451,6 +464,7 @@ class AnalysisModuleManager:
         """Stops the manager now, cancelling all running jobs."""
         self.shutdown = True
         self.immediate_shutdown = True
+        self.module_tasks_changed_event.set()
 
     async def upgrade_module(self, module: AnalysisModule) -> bool:
         """Attempts to upgrade the extended version of the analysis module.
@@ -460,7 +474,7 @@ class AnalysisModuleManager:
         try:
             if module.is_multi_process:
                 module.type = AnalysisModuleType.from_json(
-                    await asyncio.get_event_loop().run_in_executor(
+                    await asyncio.get_running_loop().run_in_executor(
                         self.executor, _cpu_task_executor_upgrade_module, module.type.to_json()
                     )
                 )
@@ -541,7 +555,7 @@ class AnalysisModuleManager:
         if module.is_multi_process:
             try:
                 request_json = request.to_json()
-                request_result_json = await asyncio.get_event_loop().run_in_executor(
+                request_result_json = await asyncio.get_running_loop().run_in_executor(
                     self.executor, _cpu_task_executor_execute_analysis, module.type.to_json(), request_json
                 )
                 return AnalysisRequest.from_json(request_result_json, self.system)
@@ -6,7 +6,7 @@
 from typing import Optional, Union
 
 from ace import coreapi
-from ace.api import ApiKey
+from ace.api.apikey import ApiKey
 from ace.exceptions import MissingEncryptionSettingsError
 
 
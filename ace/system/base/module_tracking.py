@@ -44,7 +44,9 @@ class AnalysisModuleTrackingBaseInterface:
     async def track_analysis_module_type(self, amt: AnalysisModuleType):
         assert isinstance(amt, AnalysisModuleType)
         get_logger().debug(f"tracking analysis module type {amt}")
-        return await self.i_track_analysis_module_type(amt)
+        result = await self.i_track_analysis_module_type(amt)
+        self._invalidate_amt_cache(amt.name)
+        return result
 
     async def i_track_analysis_module_type(self, amt: AnalysisModuleType):
         raise NotImplementedError()
@@ -68,6 +70,7 @@ class AnalysisModuleTrackingBaseInterface:
         await self.delete_work_queue(amt.name)
         # remove the module
         await self.i_delete_analysis_module_type(amt)
+        self._invalidate_amt_cache(amt.name)
         # remove any outstanding requests from tracking
         await self.clear_tracking_by_analysis_module_type(amt)
         # remove any cached analysis results for this type
@@ -33,6 +33,7 @@ class AnalysisRequestTrackingBaseInterface:
         return result
 
     async def i_track_analysis_request(self, request: AnalysisRequest):
+        """Tracks the given request. A request tracked with a status of TRACKING_STATUS_QUEUED is also unlocked."""
         raise NotImplementedError()
 
     @coreapi
@@ -53,6 +54,28 @@ class AnalysisRequestTrackingBaseInterface:
     async def i_unlock_analysis_request(self, request: AnalysisRequest) -> bool:
         raise NotImplementedError()
 
+    @coreapi
+    async def claim_analysis_request(self, request: AnalysisRequest, owner_uuid: str) -> Union[AnalysisRequest, None]:
+        """Assigns the request to the given owner and tracks it as being analyzed.
+        The claim is atomic: it fails if the request is already being analyzed or is no longer tracked.
+        Returns the current copy of the claimed request, or None if the claim failed."""
+        assert isinstance(request, AnalysisRequest)
+        assert isinstance(owner_uuid, str) and owner_uuid
+
+        result = await self.i_claim_analysis_request(request.id, owner_uuid)
+        if result:
+            get_logger().debug("assigned analysis request %s to %s", result, owner_uuid)
+
+            await self.fire_event(EVENT_AR_NEW, result)
+
+        return result
+
+    async def i_claim_analysis_request(self, request_id: str, owner_uuid: str) -> Union[AnalysisRequest, None]:
+        """Loads the tracked copy of the request, sets the owner and the status to TRACKING_STATUS_ANALYZING
+        and then tracks it again, but only if the request is not already being analyzed.
+        Returns the updated copy of the request, or None if it is already being analyzed or is no longer tracked."""
+        raise NotImplementedError()
+
     @coreapi
     async def link_analysis_requests(self, source_request: AnalysisRequest, dest_request: AnalysisRequest) -> bool:
         """Links the source to the dest such that when the dest has completed,
@@ -158,7 +181,7 @@ class AnalysisRequestTrackingBaseInterface:
 
         ar.owner = None
         ar.status = TRACKING_STATUS_QUEUED
-        await self.unlock_analysis_request(ar)
+        # tracking the request as queued also releases any lock held on it
         await self.track_analysis_request(ar)
 
         # if this is a RootAnalysis request then we just process it here (there is no inbound queue for root analysis)
@@ -49,7 +49,8 @@ class ACESystem(
 
     async def reset(self):
         """Resets the system. Useful for unit testing."""
-        pass
+        self._invalidate_amt_cache()
+        self._last_expired_analysis_request_check = None
 
     # should be called before start() is called
     async def initialize(self):
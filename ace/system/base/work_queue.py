@@ -3,7 +3,9 @@
 #
 #
 
-from typing import Union, Optional
+import time
+
+from typing import Awaitable, Callable, Union, Optional
 
 from ace import coreapi
 from ace.analysis import AnalysisModuleType
@@ -14,15 +16,66 @@ from ace.logging import get_logger
 from ace.exceptions import AnalysisModuleTypeVersionError, AnalysisModuleTypeExtendedVersionError
 
 
+def _as_name(amt: Union[AnalysisModuleType, str]) -> str:
+    """Returns the name of the given analysis module type, which can also be given as the name itself."""
+    if type(amt) is str:
+        return amt
+
+    assert isinstance(amt, AnalysisModuleType)
+    return amt.name
+
+
 class WorkQueueBaseInterface:
-    @coreapi
-    async def delete_work_queue(self, amt: Union[AnalysisModuleType, str]) -> bool:
-        assert isinstance(amt, AnalysisModuleType) or isinstance(amt, str)
 
-        if isinstance(amt, AnalysisModuleType):
-            amt = amt.name
+    # how long (in seconds) registered analysis module types are cached for the version checks
+    amt_cache_ttl = 5
+
+    # key = amt.name, value = tuple(time.monotonic() when cached, AnalysisModuleType)
+    _amt_cache: Optional[dict[str, tuple[float, AnalysisModuleType]]] = None
+    # incremented every time the cache is invalidated
+    _amt_cache_generation = 0
+
+    # how often (in seconds) expired analysis requests are moved back into the work queue
+    # this happens as a side effect of requesting work, at most once per interval for each type
+    expired_analysis_request_interval = 5
+
+    # key = amt.name, value = time.monotonic() of the last time expired requests were processed
+    _last_expired_analysis_request_check: Optional[dict[str, float]] = None
+
+    async def _get_cached_analysis_module_type(self, name: str) -> Union[AnalysisModuleType, None]:
+        """Returns the registered AnalysisModuleType by name, using a copy cached for up to amt_cache_ttl seconds."""
+        if self._amt_cache is None:
+            self._amt_cache = {}
+
+        cached = self._amt_cache.get(name)
+        if cached and time.monotonic() - cached[0] < self.amt_cache_ttl:
+            return cached[1]
+
+        generation = self._amt_cache_generation
+        result = await self.get_analysis_module_type(name)
+
+        # if the type was modified while we were looking it up then what we have might already be out of date
+        if result and generation == self._amt_cache_generation:
+            self._amt_cache[name] = (time.monotonic(), result)
+
+        return result
+
+    def _invalidate_amt_cache(self, name: Optional[str] = None):
+        """Removes the given type from the analysis module type cache, or clears the cache if no name is given.
+        Call this after the modification has been made."""
+        self._amt_cache_generation += 1
+        if self._amt_cache is None:
+            return
 
-        get_logger().debug(f"deleting work queue for {amt}")
+        if name is None:
+            self._amt_cache.clear()
+        else:
+            self._amt_cache.pop(name, None)
+
+    @coreapi
+    async def delete_work_queue(self, amt: Union[AnalysisModuleType, str]) -> bool:
+        amt = _as_name(amt)
+        get_logger().debug("deleting work queue for %s", amt)
         result = await self.i_delete_work_queue(amt)
         if result:
             await self.fire_event(EVENT_WORK_QUEUE_DELETED, amt)
@@ -36,11 +89,8 @@ class WorkQueueBaseInterface:
 
     @coreapi
     async def add_work_queue(self, amt: Union[AnalysisModuleType, str]) -> bool:
-        assert isinstance(amt, AnalysisModuleType) or isinstance(amt, str)
-        if isinstance(amt, AnalysisModuleType):
-            amt = amt.name
-
-        get_logger().debug(f"adding work queue for {amt}")
+        amt = _as_name(amt)
+        get_logger().debug("adding work queue for %s", amt)
         result = await self.i_add_work_queue(amt)
         if result:
             await self.fire_event(EVENT_WORK_QUEUE_NEW, amt)
@@ -55,13 +105,11 @@ class WorkQueueBaseInterface:
 
     @coreapi
     async def put_work(self, amt: Union[AnalysisModuleType, str], analysis_request: AnalysisRequest):
-        assert isinstance(amt, AnalysisModuleType) or isinstance(amt, str)
         assert isinstance(analysis_request, AnalysisRequest)
 
-        if isinstance(amt, AnalysisModuleType):
-            amt = amt.name
+        amt = _as_name(amt)
+        get_logger().debug("adding request %s to work queue for %s", analysis_request, amt)
 
-        get_logger().debug(f"adding request {analysis_request} to work queue for {amt}")
         result = await self.i_put_work(amt, analysis_request)
         await self.fire_event(EVENT_WORK_ADD, [amt, analysis_request])
         return result
@@ -72,12 +120,9 @@ class WorkQueueBaseInterface:
 
     @coreapi
     async def get_work(self, amt: Union[AnalysisModuleType, str], timeout: int) -> Union[AnalysisRequest, None]:
-        assert isinstance(amt, AnalysisModuleType) or isinstance(amt, str)
         assert isinstance(timeout, int)
 
-        if isinstance(amt, AnalysisModuleType):
-            amt = amt.name
-
+        amt = _as_name(amt)
         result = await self.i_get_work(amt, timeout)
         if result:
             await self.fire_event(EVENT_WORK_REMOVE, [amt, result])
@@ -95,13 +140,37 @@ class WorkQueueBaseInterface:
         raise NotImplementedError()
 
     @coreapi
-    async def get_queue_size(self, amt: Union[AnalysisModuleType, str]) -> int:
-        assert isinstance(amt, AnalysisModuleType) or isinstance(amt, str)
+    async def get_work_batch(
+        self, amt: Union[AnalysisModuleType, str], count: int, timeout: int
+    ) -> list[AnalysisRequest]:
+        assert isinstance(count, int) and count > 0
+        assert isinstance(timeout, int)
 
-        if isinstance(amt, AnalysisModuleType):
-            amt = amt.name
+        amt = _as_name(amt)
+        result = await self.i_get_work_batch(amt, count, timeout)
+        for analysis_request in result:
+            await self.fire_event(EVENT_WORK_REMOVE, [amt, analysis_request])
+
+        return result
 
-        return await self.i_get_queue_size(amt)
+    async def i_get_work_batch(self, amt: str, count: int, timeout: int) -> list[AnalysisRequest]:
+        """Gets up to count AnalysisRequest objects from the work queue for the given type.
+        Only waits (up to timeout seconds) for the first one.
+        The default implementation calls i_get_work repeatedly."""
+        result = []
+        next_ar = await self.i_get_work(amt, timeout)
+        while next_ar:
+            result.append(next_ar)
+            if len(result) == count:
+                break
+
+            next_ar = await self.i_get_work(amt, 0)
+
+        return result
+
+    @coreapi
+    async def get_queue_size(self, amt: Union[AnalysisModuleType, str]) -> int:
+        return await self.i_get_queue_size(_as_name(amt))
 
     async def i_get_queue_size(self, amt: str) -> int:
         """Returns the current size of the work queue for the given type."""
@@ -114,7 +183,7 @@ class WorkQueueBaseInterface:
         amt: Union[AnalysisModuleType, str],
         timeout: Optional[int] = 0,
         version: Optional[str] = None,
-        extended_version: Optional[dict[str, str]] = {},
+        extended_version: Optional[dict[str, str]] = None,
     ) -> Union[AnalysisRequest, None]:
         """Returns the next AnalysisRequest for the given AnalysisModuleType, or None if nothing is available.
         This function is called by the analysis modules to get the next work item.
@@ -133,51 +202,137 @@ class WorkQueueBaseInterface:
         Returns:
             An AnalysisRequest to be processed, or None if no work requests are available."""
 
+        result = await self.get_next_analysis_requests(
+            owner_uuid, amt, 1, timeout=timeout, version=version, extended_version=extended_version
+        )
+        return result[0] if result else None
+
+    @coreapi
+    async def get_next_analysis_requests(
+        self,
+        owner_uuid: str,
+        amt: Union[AnalysisModuleType, str],
+        count: int,
+        timeout: Optional[int] = 0,
+        version: Optional[str] = None,
+        extended_version: Optional[dict[str, str]] = None,
+    ) -> list[AnalysisRequest]:
+        """Returns up to count AnalysisRequest objects for the given AnalysisModuleType.
+        The version checks and the processing of expired requests are done once for the entire batch.
+        Only the first request waits for timeout seconds; the rest are only taken if they are already available.
+
+        Args:
+            owner_uuid: Represents the owner of the requests.
+            amt: The AnalysisModuleType that the requests are for.
+            count: The maximum number of requests to return.
+            timeout: How long to wait (in seconds) for the first work request to come in.
+            version: Optional module version. See get_next_analysis_request.
+            extended_version: Optional module extended version.
+
+        Returns:
+            A list of AnalysisRequest objects to be processed, which is empty if no work requests are available."""
+
         assert isinstance(owner_uuid, str) and owner_uuid
         assert isinstance(amt, AnalysisModuleType) or (isinstance(amt, str) and amt)
+        assert isinstance(count, int) and count > 0
         assert isinstance(timeout, int)
         assert version is None or (isinstance(version, str) and version)
-        assert isinstance(extended_version, dict)
+        assert extended_version is None or isinstance(extended_version, dict)
 
         # did we just pass the name and version?
         if isinstance(amt, str):
             if version is None:
                 raise ValueError("missing required version parameter when passing amt as string")
 
-            amt = AnalysisModuleType(name=amt, description="", version=version, extended_version=extended_version)
+            if extended_version is None:
+                extended_version = {}
+
+            existing_amt = await self._get_cached_analysis_module_type(amt)
+            if existing_amt and existing_amt.version == version and existing_amt.extended_version == extended_version:
+                # use the registered type instead of building a new one on every call
+                amt = existing_amt
+            else:
+                amt = AnalysisModuleType(name=amt, description="", version=version, extended_version=extended_version)
+
+        return await self._get_next_analysis_requests(owner_uuid, amt, count, timeout)
+
+    def get_next_analysis_request_for(
+        self, owner_uuid: str, amt: AnalysisModuleType
+    ) -> Callable[[int], Awaitable[Union[AnalysisRequest, None]]]:
+        """Returns an async function that takes an optional timeout and returns the next AnalysisRequest
+        for the given owner and AnalysisModuleType, or None if nothing is available.
+        The arguments are only validated once, which is useful for workers that repeatedly request work
+        for the same type. The version checks are still performed on every call."""
+
+        assert isinstance(owner_uuid, str) and owner_uuid
+        assert isinstance(amt, AnalysisModuleType)
+
+        get_next_analysis_requests = self._get_next_analysis_requests
+
+        async def _get_next_analysis_request(timeout: int = 0) -> Union[AnalysisRequest, None]:
+            result = await get_next_analysis_requests(owner_uuid, amt, 1, timeout)
+            return result[0] if result else None
+
+        return _get_next_analysis_request
+
+    async def _get_next_analysis_requests(
+        self, owner_uuid: str, amt: AnalysisModuleType, count: int, timeout: int
+    ) -> list[AnalysisRequest]:
+        """Implements get_next_analysis_requests after the arguments have been validated."""
+        existing_amt = await self._get_cached_analysis_module_type(amt.name)
+
+        # the cached copy may be stale if the type was modified by another process
+        # so a mismatch is always confirmed against the registered type before failing the request
+        if existing_amt and not (existing_amt.version_matches(amt) and existing_amt.extended_version_matches(amt)):
+            self._invalidate_amt_cache(amt.name)
+            existing_amt = await self._get_cached_analysis_module_type(amt.name)
 
         # make sure that the requested analysis module hasn't been replaced by a newer version
         # if that's the case then the request fails and the requestor needs to update to the new version
-        existing_amt = await self.get_analysis_module_type(amt.name)
         if existing_amt and not existing_amt.version_matches(amt):
-            get_logger().info(f"requested amt {amt} version mismatch against {existing_amt}")
+            get_logger().info("requested amt %s version mismatch against %s", amt, existing_amt)
             raise AnalysisModuleTypeVersionError(amt, existing_amt)
 
         if existing_amt and not existing_amt.extended_version_matches(amt):
-            get_logger().info(f"requested amt {amt} extended version mismatch against {existing_amt}")
+            get_logger().info("requested amt %s extended version mismatch against %s", amt, existing_amt)
             raise AnalysisModuleTypeExtendedVersionError(amt, existing_amt)
 
         # make sure expired analysis requests go back in the work queues
-        await self.process_expired_analysis_requests(amt)
-
-        # we don't need to do any locking here because of how the work queues work
-        while True:
-            next_ar = await self.get_work(amt, timeout)
-
-            if next_ar:
-                # get the most recent copy of the analysis request
-                next_ar = await self.get_analysis_request_by_request_id(next_ar.id)
-                # if it was deleted then we ignore it and move on to the next one
-                # this can happen if the request is deleted while it's waiting in the queue
-                if not next_ar:
-                    get_logger().warning("unknown request {next_ar} aquired from work queue for {amt}")
+        if self._last_expired_analysis_request_check is None:
+            self._last_expired_analysis_request_check = {}
+
+        now = time.monotonic()
+        last_check = self._last_expired_analysis_request_check.get(amt.name)
+        if last_check is None or now - last_check >= self.expired_analysis_request_interval:
+            self._last_expired_analysis_request_check[amt.name] = now
+            await self.process_expired_analysis_requests(amt)
+
+        # no locking is needed here: the work queues hand out each entry once
+        # and the claim below is a compare-and-set on the tracked request
+        result = []
+        deadline = time.monotonic() + timeout
+        while len(result) < count:
+            # only wait for the first request, and only for whatever is left of the timeout
+            # if we had to skip over requests that were deleted
+            batch = await self.get_work_batch(
+                amt, count - len(result), 0 if result else max(0, int(deadline - time.monotonic()))
+            )
+            if not batch:
+                break
+
+            for next_ar in batch:
+                # atomically take ownership of the most recent copy of the analysis request
+                # this fails if the request was deleted while it was waiting in the queue
+                # or if someone else already has it (it was queued more than once)
+                # in either case we ignore it and move on to the next one
+                claimed_ar = await self.claim_analysis_request(next_ar, owner_uuid)
+                if not claimed_ar:
+                    get_logger().warning(
+                        "request %s acquired from work queue for %s was deleted or already claimed", next_ar, amt
+                    )
                     continue
 
-                # set the owner, status then update
-                next_ar.owner = owner_uuid
-                next_ar.status = TRACKING_STATUS_ANALYZING
-                get_logger().debug(f"assigned analysis request {next_ar} to {owner_uuid}")
-                await self.track_analysis_request(next_ar)
-                await self.fire_event(EVENT_WORK_ASSIGNED, next_ar)
+                await self.fire_event(EVENT_WORK_ASSIGNED, claimed_ar)
+                result.append(claimed_ar)
 
-            return next_ar
+        return result
@@ -5,7 +5,7 @@ import uuid
 
 from typing import Optional, Union
 
-from ace.api import ApiKey
+from ace.api.apikey import ApiKey
 from ace.system.base import AuthenticationBaseInterface
 from ace.system.database.schema import ApiKey as ApiKeyDbModel
 from ace.exceptions import DuplicateApiKeyNameError
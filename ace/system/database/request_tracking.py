@@ -11,12 +11,12 @@ import ace
 from ace.analysis import Observable, AnalysisModuleType
 from ace.system.base import AnalysisRequestTrackingBaseInterface
 from ace.system.database.schema import AnalysisRequestTracking, analysis_request_links
-from ace.constants import TRACKING_STATUS_ANALYZING, EVENT_AR_EXPIRED
+from ace.constants import TRACKING_STATUS_ANALYZING, TRACKING_STATUS_QUEUED, EVENT_AR_EXPIRED, EVENT_AR_NEW
 from ace.system.requests import AnalysisRequest
 from ace.system.caching import generate_cache_key
 from ace.exceptions import UnknownAnalysisModuleTypeError
 
-from sqlalchemy import and_, text
+from sqlalchemy import and_, bindparam, text
 from sqlalchemy.sql import delete, update, select
 from sqlalchemy.orm import selectinload
 
@@ -25,9 +25,10 @@ class DatabaseAnalysisRequestTrackingInterface(AnalysisRequestTrackingBaseInterf
     # if we switched to TRACKING_STATUS_ANALYZING then we start the expiration timer
     async def i_track_analysis_request(self, request: AnalysisRequest):
         # XXX we're using server-side time instead of database time
+        # the deadline is computed once here so the expiration queries only compare against the stored value
         expiration_date = None
         if request.status == TRACKING_STATUS_ANALYZING:
-            expiration_date = datetime.datetime.now() + datetime.timedelta(request.type.timeout)
+            expiration_date = datetime.datetime.now() + datetime.timedelta(seconds=request.type.timeout)
 
         db_request = AnalysisRequestTracking(
             id=request.id,
@@ -38,10 +39,47 @@ class DatabaseAnalysisRequestTrackingInterface(AnalysisRequestTrackingBaseInterf
             json_data=request.to_json(),
         )
 
+        # a request that goes (back) into the queue is free to be picked up again
+        # so the lock is cleared as part of the same write
+        if request.status == TRACKING_STATUS_QUEUED:
+            db_request.lock = None
+
         async with self.get_db() as db:
             await db.merge(db_request)
             await db.commit()
 
+    async def i_claim_analysis_request(self, request_id: str, owner_uuid: str) -> Union[AnalysisRequest, None]:
+        # a request only has an expiration date while it is being analyzed
+        # so the claim is a compare-and-set on that column
+        not_analyzing = and_(
+            AnalysisRequestTracking.id == request_id,
+            AnalysisRequestTracking.expiration_date == None,  # noqa:E711
+        )
+
+        async with self.get_db() as db:
+            db_request = (await db.execute(select(AnalysisRequestTracking).where(not_analyzing))).scalar()
+            if db_request is None:
+                return None
+
+            request = AnalysisRequest.from_json(db_request.json_data, self)
+            request.owner = owner_uuid
+            request.status = TRACKING_STATUS_ANALYZING
+
+            count = (
+                await db.execute(
+                    update(AnalysisRequestTracking)
+                    .where(not_analyzing)
+                    .values(
+                        expiration_date=datetime.datetime.now() + datetime.timedelta(seconds=request.type.timeout),
+                        json_data=request.to_json(),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            ).rowcount
+            await db.commit()
+
+        return request if count == 1 else None
+
     async def i_link_analysis_requests(self, source: AnalysisRequest, dest: AnalysisRequest) -> bool:
         from sqlalchemy import select, bindparam, String, and_
 
@@ -177,18 +215,68 @@ class DatabaseAnalysisRequestTrackingInterface(AnalysisRequestTrackingBaseInterf
 
     async def i_process_expired_analysis_requests(self, amt: AnalysisModuleType) -> int:
         assert isinstance(amt, AnalysisModuleType)
+
+        # move all of the expired requests for this type back into the queued state with one update statement
+        # the selected rows are locked (where the database supports it) and the update only applies while they are
+        # still expired, so if a concurrent sweep got to any of them first the whole claim is left to that sweep
+        # and a request is never queued twice
         async with self.get_db() as db:
-            for db_request in await db.execute(
-                select(AnalysisRequestTracking).where(
-                    and_(
-                        AnalysisRequestTracking.analysis_module_type == amt.name,
-                        datetime.datetime.now() > AnalysisRequestTracking.expiration_date,
+            now = datetime.datetime.now()
+            expired_requests = []
+            for db_request in (
+                await db.execute(
+                    select(AnalysisRequestTracking)
+                    .where(
+                        and_(
+                            AnalysisRequestTracking.analysis_module_type == amt.name,
+                            now > AnalysisRequestTracking.expiration_date,
+                        )
+                    )
+                    .with_for_update()
+                )
+            ).scalars():
+                request = AnalysisRequest.from_json(db_request.json_data, self)
+                request.owner = None
+                request.status = TRACKING_STATUS_QUEUED
+                expired_requests.append(request)
+
+            if not expired_requests:
+                return 0
+
+            count = (
+                await db.execute(
+                    update(AnalysisRequestTracking)
+                    .where(
+                        and_(
+                            AnalysisRequestTracking.id == bindparam("request_id"),
+                            now > AnalysisRequestTracking.expiration_date,
+                        )
                     )
+                    .values(expiration_date=None, lock=None, json_data=bindparam("request_json"))
+                    .execution_options(synchronize_session=False),
+                    [{"request_id": _.id, "request_json": _.to_json()} for _ in expired_requests],
                 )
-            ):
-                request = AnalysisRequest.from_json(db_request[0].json_data, self)
-                await self.fire_event(EVENT_AR_EXPIRED, request)
-                try:
-                    await self.queue_analysis_request(request)
-                except UnknownAnalysisModuleTypeError:
-                    self.delete_analysis_request(request)
+            ).rowcount
+
+            if count != len(expired_requests):
+                await db.rollback()
+                return 0
+
+            await db.commit()
+
+        # track_analysis_request refuses requests for types that are no longer registered
+        # every request here has the same type so that is checked once for all of them
+        registered = await self.get_analysis_module_type(amt.name) is not None
+        for request in expired_requests:
+            await self.fire_event(EVENT_AR_EXPIRED, request)
+            if not registered:
+                await self.delete_analysis_request(request)
+                continue
+
+            await self.fire_event(EVENT_AR_NEW, request)
+            try:
+                await self.put_work(amt, request)
+            except UnknownAnalysisModuleTypeError:
+                await self.delete_analysis_request(request)
+
+        return len(expired_requests)
@@ -1,7 +1,13 @@
 # vim: ts=4:sw=4:et:cc=120
 # flake8: noqa
 
-from ace.data_model import AnalysisRequestModel, AnalysisRequestQueryModel, ErrorModel
+from ace.data_model import (
+    AnalysisRequestModel,
+    AnalysisRequestQueryModel,
+    AnalysisRequestBatchQueryModel,
+    AnalysisRequestListModel,
+    ErrorModel,
+)
 from ace.constants import ERROR_AMT_VERSION
 from ace.exceptions import ACEError
 from ace.system.distributed import app, TAG_WORK_QUEUE
@@ -37,3 +43,29 @@ async def api_get_next_analysis_request(query: AnalysisRequestQueryModel):
         return Response(status_code=204)
 
     return result.to_model()
+
+
+@app.post(
+    "/work_queue/batch",
+    name="Get Next Analysis Requests",
+    responses={
+        200: {"model": AnalysisRequestListModel, "description": "Returns up to count analysis requests to process."},
+        400: {"model": ErrorModel},
+    },
+    tags=[TAG_WORK_QUEUE],
+    description="""Gets up to count analysis requests for the given analysis module type in a single call. Only the first request waits for the timeout. An empty list is returned if no work was available. The version requirements are the same as for getting a single request.""",
+)
+async def api_get_next_analysis_requests(query: AnalysisRequestBatchQueryModel):
+    try:
+        result = await app.state.system.get_next_analysis_requests(
+            query.owner,
+            query.amt,
+            query.count,
+            timeout=query.timeout,
+            version=query.version,
+            extended_version=query.extended_version,
+        )
+    except ACEError as e:
+        return JSONResponse(status_code=400, content=ErrorModel(code=e.code, details=str(e)).dict())
+
+    return AnalysisRequestListModel(analysis_requests=[_.to_model() for _ in result])
@@ -68,6 +68,23 @@ class RedisWorkQueueManagerInterface(WorkQueueBaseInterface):
                 _, result = result
                 return AnalysisRequest.from_json(result.decode(), system=self)
 
+    async def i_get_work_batch(self, amt: str, count: int, timeout: int) -> list[AnalysisRequest]:
+        next_ar = await self.i_get_work(amt, timeout)
+        if next_ar is None:
+            return []
+
+        result = [next_ar]
+        if count > 1:
+            # take the rest of the batch in a single round trip
+            async with self.get_redis_connection() as rc:
+                transaction = rc.multi_exec()
+                items = transaction.lrange(get_queue_name(amt), 0, count - 2)
+                transaction.ltrim(get_queue_name(amt), count - 1, -1)
+                await transaction.execute()
+                result.extend([AnalysisRequest.from_json(_.decode(), system=self) for _ in await items])
+
+        return result
+
     async def i_get_queue_size(self, amt: str) -> int:
         async with self.get_redis_connection() as rc:
             if not await rc.hexists(KEY_WORK_QUEUES, amt):
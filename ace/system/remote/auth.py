@@ -2,7 +2,7 @@
 
 from typing import Optional
 
-from ace.api import ApiKey
+from ace.api.apikey import ApiKey
 from ace.system.base import AuthenticationBaseInterface
 
 
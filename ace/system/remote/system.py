@@ -55,6 +55,10 @@ class RemoteACESystem(
         self.client_kwargs = client_kwargs
         self.api = RemoteAceAPI(self, api_key, url, client_args=client_args, client_kwargs=client_kwargs)
 
+    async def stop(self):
+        await super().stop()
+        await self.api.close()
+
     def get_api(self) -> AceAPI:
         # if the api key changed then create a new api object to use
         # if self.api_key != self.api.api_key:
@@ -14,10 +14,28 @@ class RemoteWorkQueueManagerInterface(WorkQueueBaseInterface):
         amt: Union[AnalysisModuleType, str],
         timeout: Optional[int] = 0,
         version: Optional[str] = None,
-        extended_version: Optional[dict[str, str]] = [],
+        extended_version: Optional[dict[str, str]] = None,
     ) -> Union[AnalysisRequest, None]:
         return await self.get_api().get_next_analysis_request(owner_uuid, amt, timeout, version, extended_version)
 
+    async def get_next_analysis_requests(
+        self,
+        owner_uuid: str,
+        amt: Union[AnalysisModuleType, str],
+        count: int,
+        timeout: Optional[int] = 0,
+        version: Optional[str] = None,
+        extended_version: Optional[dict[str, str]] = None,
+    ) -> list[AnalysisRequest]:
+        return await self.get_api().get_next_analysis_requests(
+            owner_uuid, amt, count, timeout, version, extended_version
+        )
+
+    async def _get_next_analysis_requests(
+        self, owner_uuid: str, amt: AnalysisModuleType, count: int, timeout: int
+    ) -> list[AnalysisRequest]:
+        return await self.get_api().get_next_analysis_requests(owner_uuid, amt, count, timeout)
+
     async def delete_work_queue(self, amt: Union[AnalysisModuleType, str]) -> bool:
         raise NotImplementedError()
 
@@ -30,5 +48,10 @@ class RemoteWorkQueueManagerInterface(WorkQueueBaseInterface):
     async def get_work(self, amt: Union[AnalysisModuleType, str], timeout: int) -> Union[AnalysisRequest, None]:
         raise NotImplementedError()
 
+    async def get_work_batch(
+        self, amt: Union[AnalysisModuleType, str], count: int, timeout: int
+    ) -> list[AnalysisRequest]:
+        raise NotImplementedError()
+
     async def get_queue_size(self, amt: Union[AnalysisModuleType, str]) -> int:
         raise NotImplementedError()
@@ -15,7 +15,7 @@ class ThreadedAlertTrackingInterface(AlertingBaseInterface):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.alert_systems = {}  # key = system name, value = queue.Queue(of RootAnalysis.uuid)
-        self.alert_sync_lock = threading.RLock()
+        self.alert_sync_lock = threading.Lock()
 
     async def i_register_alert_system(self, name: str) -> bool:
         with self.alert_sync_lock:
@@ -32,12 +32,12 @@ class ThreadedAlertTrackingInterface(AlertingBaseInterface):
     async def i_submit_alert(self, root_uuid: str) -> bool:
         assert isinstance(root_uuid, str) and root_uuid
 
-        result = False
-        for name, work_queue in self.alert_systems.items():
+        # iterate over a snapshot so that alert systems can be (un)registered concurrently
+        work_queues = list(self.alert_systems.values())
+        for work_queue in work_queues:
             work_queue.put(root_uuid)
-            result = True
 
-        return result
+        return bool(work_queues)
 
     async def i_get_alerts(self, name: str, timeout: Optional[int] = None) -> list[str]:
         assert isinstance(name, str) and str
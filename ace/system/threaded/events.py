@@ -12,16 +12,16 @@ from ace.system.events import EventHandler
 class ThreadedEventInterafce(EventBaseInterface):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # the handler lists are never modified in place, they are replaced with updated copies
+        # so firing an event can read them without taking the lock
         self.event_handlers = {}  # key = event, value = [EventHandler]
-        self.event_sync_lock = threading.RLock()
+        self.event_sync_lock = threading.Lock()
 
     async def i_register_event_handler(self, event: str, handler: EventHandler):
         with self.event_sync_lock:
-            if event not in self.event_handlers:
-                self.event_handlers[event] = []
-
-            if handler not in self.event_handlers[event]:
-                self.event_handlers[event].append(handler)
+            handlers = self.event_handlers.get(event, [])
+            if handler not in handlers:
+                self.event_handlers[event] = handlers + [handler]
 
     async def i_remove_event_handler(self, handler: EventHandler, events: Optional[list[str]] = []):
         with self.event_sync_lock:
@@ -30,21 +30,27 @@ class ThreadedEventInterafce(EventBaseInterface):
 
             for event in events:
                 if handler in self.event_handlers[event]:
-                    self.event_handlers[event].remove(handler)
+                    self.event_handlers[event] = [_ for _ in self.event_handlers[event] if _ != handler]
 
     async def i_get_event_handlers(self, event: str) -> list[EventHandler]:
-        with self.event_sync_lock:
-            return self.event_handlers.get(event, [])
+        # callers get their own copy so they cannot modify the list that firing reads without the lock
+        return list(self.event_handlers.get(event, []))
 
     async def i_fire_event(self, event: Event):
         assert isinstance(event, Event)
 
+        # most events (such as the work queue events) usually have nothing listening
+        # the stored list is never modified in place so it can be read as is
+        handlers = self.event_handlers.get(event.name)
+        if not handlers:
+            return
+
         # have this go through serialization even though we don't really need to
         # just to stay consistent with how the event system works
         event_json = event.json(encoder=custom_json_encoder)
         event = Event.parse_raw(event_json)
 
-        for handler in await self.get_event_handlers(event.name):
+        for handler in handlers:
             try:
                 await handler.handle_event(event)
             except Exception as e:
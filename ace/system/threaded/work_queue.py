@@ -1,6 +1,9 @@
 # vim: ts=4:sw=4:et:cc=120
 
-import queue
+import asyncio
+import collections
+import time
+
 from typing import Union
 
 from ace.analysis import AnalysisModuleType
@@ -11,41 +14,68 @@ from ace.exceptions import UnknownAnalysisModuleTypeError
 
 class ThreadedWorkQueueManagerInterface(WorkQueueBaseInterface):
 
-    work_queues = {}  # key = amt.name, value = queue.Queue
+    # how often (in seconds) an empty work queue is checked while waiting for work
+    work_queue_poll_interval = 0.01
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # append and popleft on a deque are atomic so no additional locking is needed
+        self.work_queues = {}  # key = amt.name, value = collections.deque
 
     async def i_delete_work_queue(self, analysis_module_name: str) -> bool:
-        try:
-            del self.work_queues[analysis_module_name]
-            return True
-        except KeyError:
-            return False
+        return self.work_queues.pop(analysis_module_name, None) is not None
 
     async def i_add_work_queue(self, analysis_module_name: str) -> bool:
-        if analysis_module_name not in self.work_queues:
-            self.work_queues[analysis_module_name] = queue.Queue()
-            return True
-
-        return False
+        # single setdefault call so that concurrent adds cannot both create the queue
+        new_queue = collections.deque()
+        return self.work_queues.setdefault(analysis_module_name, new_queue) is new_queue
 
     async def i_get_work(self, amt: str, timeout: int) -> Union[AnalysisRequest, None]:
         assert isinstance(amt, str)
         assert isinstance(timeout, int)
 
         try:
-            result = self.work_queues[amt].get(block=True, timeout=timeout)
-            result.system = self
-            return result
+            work_queue = self.work_queues[amt]
         except KeyError:
             raise UnknownAnalysisModuleTypeError()
-        except queue.Empty:
-            return None
+
+        # poll rather than block on the queue so the event loop keeps running while we wait
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                result = work_queue.popleft()
+                result.system = self
+                return result
+            except IndexError:
+                if time.monotonic() >= deadline:
+                    return None
+
+                await asyncio.sleep(self.work_queue_poll_interval)
+
+    async def i_get_work_batch(self, amt: str, count: int, timeout: int) -> list[AnalysisRequest]:
+        next_ar = await self.i_get_work(amt, timeout)
+        if next_ar is None:
+            return []
+
+        result = [next_ar]
+        work_queue = self.work_queues.get(amt)
+        while work_queue and len(result) < count:
+            try:
+                next_ar = work_queue.popleft()
+            except IndexError:
+                break
+
+            next_ar.system = self
+            result.append(next_ar)
+
+        return result
 
     async def i_put_work(self, amt: str, analysis_request: AnalysisRequest):
         assert isinstance(amt, str)
         assert isinstance(analysis_request, AnalysisRequest)
 
         try:
-            self.work_queues[amt].put(analysis_request)
+            self.work_queues[amt].append(analysis_request)
         except KeyError:
             raise UnknownAnalysisModuleTypeError()
 
@@ -53,7 +83,7 @@ class ThreadedWorkQueueManagerInterface(WorkQueueBaseInterface):
         assert isinstance(amt, str)
 
         try:
-            return self.work_queues[amt].qsize()
+            return len(self.work_queues[amt])
         except KeyError:
             raise UnknownAnalysisModuleTypeError()
 
@@ -4,9 +4,23 @@
 import datetime
 import re
 
-import pytz
+from typing import Optional
+
 import tzlocal
 
+
+def _get_local_timezone() -> datetime.tzinfo:
+    """Returns the local timezone. If the local timezone cannot be loaded by name (for example TZ=CST6)
+    then the current UTC offset of the system is used instead."""
+    try:
+        return tzlocal.get_localzone()
+    except (KeyError, ValueError):  # zoneinfo.ZoneInfoNotFoundError is a KeyError
+        return datetime.datetime.now().astimezone().tzinfo
+
+
+# the timezone assumed for times that do not specify one
+LOCAL_TIMEZONE = _get_local_timezone()
+
 # the expected format of the event_time of an alert
 event_time_format_tz = "%Y-%m-%d %H:%M:%S %z"
 # the old time format before we started storing timezones
@@ -25,37 +39,112 @@ RE_ET_ISO_FORMAT = re.compile(
     r"^[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}\.[0-9]{3,6}[+-][0-9]{2}:[0-9]{2}$"
 )
 
+# all of the formats above by name
+_FORMATS = {
+    "tz": RE_ET_FORMAT,
+    "old": RE_ET_OLD_FORMAT,
+    "json_tz": RE_ET_JSON_FORMAT,
+    "iso": RE_ET_ISO_FORMAT,
+    "old_json": RE_ET_OLD_JSON_FORMAT,
+}
+
+# all of the formats above as a single alternation so that a parse only runs one match
+# the name of the group that matched identifies the format
+RE_ET_ALL = re.compile("|".join(f"(?P<{name}>{regex.pattern})" for name, regex in _FORMATS.items()))
+
+
+def _guess_format(event_time: str) -> Optional[str]:
+    """Returns the name of the format the event_time most likely uses based on the position of the delimiters,
+    or None if it does not look like any of them. The guess still needs to be validated."""
+    length = len(event_time)
+    if length < 19:
+        return None
+
+    if event_time[10] == " ":
+        if length == 19:
+            return "old"
+        elif length == 25:
+            return "tz"
+    elif event_time[10] == "T" and length > 19 and event_time[19] == ".":
+        if event_time[-3] == ":":
+            return "iso"
+        elif event_time[-5] in "+-":
+            return "json_tz"
+        else:
+            return "old_json"
 
-def parse_datetime_string(event_time):
+    return None
+
+
+# one shared tzinfo per utc offset (in minutes)
+_OFFSET_CACHE: dict[int, datetime.tzinfo] = {0: datetime.timezone.utc}
+
+
+def _get_fixed_offset(offset: str) -> datetime.tzinfo:
+    """Returns the tzinfo for the given [+-]HHMM or [+-]HH:MM offset string."""
+    minutes = int(offset[1:3]) * 60 + int(offset[-2:])
+    if offset[0] == "-":
+        minutes = -minutes
+
+    try:
+        return _OFFSET_CACHE[minutes]
+    except KeyError:
+        return _OFFSET_CACHE.setdefault(minutes, datetime.timezone(datetime.timedelta(minutes=minutes)))
+
+
+def parse_datetime_string(event_time: str) -> datetime.datetime:
     """Return the datetime object for the given event_time."""
     # remove any leading or trailing whitespace
     event_time = event_time.strip()
 
-    if RE_ET_FORMAT.match(event_time):
-        return datetime.datetime.strptime(event_time, event_time_format_tz).astimezone(pytz.utc)
-    elif RE_ET_OLD_FORMAT.match(event_time):
+    # check the format we expect first and only try all of them if that doesn't match
+    format_name = _guess_format(event_time)
+    if format_name is None or not _FORMATS[format_name].match(event_time):
+        m = RE_ET_ALL.match(event_time)
+        if m is None:
+            raise ValueError("invalid date format {}".format(event_time))
+
+        format_name = m.lastgroup
+
+    # the formats with a numeric timezone are parsed directly by position instead of using strptime
+    if format_name == "tz":
+        return datetime.datetime(
+            int(event_time[0:4]),
+            int(event_time[5:7]),
+            int(event_time[8:10]),
+            int(event_time[11:13]),
+            int(event_time[14:16]),
+            int(event_time[17:19]),
+            tzinfo=_get_fixed_offset(event_time[20:]),
+        ).astimezone(datetime.timezone.utc)
+    elif format_name == "json_tz" or format_name == "iso":
+        # the iso format has a : in the timezone specifier
+        offset_length = 5 if format_name == "json_tz" else 6
+        return datetime.datetime(
+            int(event_time[0:4]),
+            int(event_time[5:7]),
+            int(event_time[8:10]),
+            int(event_time[11:13]),
+            int(event_time[14:16]),
+            int(event_time[17:19]),
+            # fractional seconds are 3 to 6 digits
+            int(event_time[20:-offset_length].ljust(6, "0")),
+            tzinfo=_get_fixed_offset(event_time[-offset_length:]),
+        ).astimezone(datetime.timezone.utc)
+    elif format_name == "old":
         return (
             datetime.datetime.strptime(event_time, event_time_format)
-            .replace(tzinfo=tzlocal.get_localzone())
-            .astimezone(pytz.utc)
+            .replace(tzinfo=LOCAL_TIMEZONE)
+            .astimezone(datetime.timezone.utc)
         )
-    elif RE_ET_JSON_FORMAT.match(event_time):
-        return datetime.datetime.strptime(event_time, event_time_format_json_tz).astimezone(pytz.utc)
-    elif RE_ET_ISO_FORMAT.match(event_time):
-        # we just need to remove the : in the timezone specifier
-        # this has been fixed in python 3.7
-        event_time = event_time[: event_time.rfind(":")] + event_time[event_time.rfind(":") + 1 :]
-        return datetime.datetime.strptime(event_time, event_time_format_json_tz).astimezone(pytz.utc)
-    elif RE_ET_OLD_JSON_FORMAT.match(event_time):
+    else:  # old_json
         return (
             datetime.datetime.strptime(event_time, event_time_format_json)
-            .replace(tzinfo=tzlocal.get_localzone())
-            .astimezone(pytz.utc)
+            .replace(tzinfo=LOCAL_TIMEZONE)
+            .astimezone(datetime.timezone.utc)
         )
-    else:
-        raise ValueError("invalid date format {}".format(event_time))
 
 
-def utc_now():
+def utc_now() -> datetime.datetime:
     """Returns datetime.datetime.now() in UTC time zone."""
-    return datetime.datetime.now(pytz.utc)
+    return datetime.datetime.now(datetime.timezone.utc)
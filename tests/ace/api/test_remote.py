@@ -0,0 +1,36 @@
+import asyncio
+
+from ace.api.remote import RemoteAceAPI
+from ace.system import ACESystem
+
+import httpx
+import pytest
+
+
+class YieldingCloseTransport(httpx.AsyncBaseTransport):
+    """A transport that gives up control when it is closed like a real connection pool would."""
+
+    async def aclose(self):
+        await asyncio.sleep(0)
+
+
+async def _get_client(api: RemoteAceAPI):
+    async with api.get_client() as client:
+        return client
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_get_client_concurrent():
+    api = RemoteAceAPI(ACESystem(), "test", "http://test", client_kwargs={"transport": YieldingCloseTransport()})
+    try:
+        old_client = await _get_client(api)
+
+        # changing the api key makes the client stale
+        # concurrent callers replace it with a single new client
+        api.api_key = "other"
+        clients = await asyncio.gather(*[_get_client(api) for _ in range(10)])
+        assert clients[0] is not old_client
+        assert all(client is clients[0] for client in clients)
+    finally:
+        await api.close()
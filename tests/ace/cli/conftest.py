@@ -1,6 +1,5 @@
-from ace.crypto import initialize_encryption_settings
 from ace.env import get_env
-from tests.systems import DatabaseACETestSystem
+from tests.systems import DatabaseACETestSystem, get_test_encryption_settings
 
 import pytest
 
@@ -10,8 +9,7 @@ async def initialize_cli_environment(monkeypatch):
     monkeypatch.setenv("ACE_ADMIN_PASSWORD", "test")
     monkeypatch.setenv("ACE_DB_URL", "sqlite+aiosqlite://")
     system = DatabaseACETestSystem()
-    system.encryption_settings = await initialize_encryption_settings("test")
-    system.encryption_settings.load_aes_key("test")
+    system.encryption_settings = await get_test_encryption_settings("test")
     await system.initialize()
     await system.start()
     await system.reset()
@@ -4,7 +4,6 @@ from ace.analysis import RootAnalysis, AnalysisModuleType
 from ace.cli.analysis import display_analysis
 
 import pytest
-import pytz
 
 
 @pytest.mark.unit
@@ -18,7 +17,7 @@ def test_display_analysis(capsys):
     proxy_analysis_type = AnalysisModuleType(name="Proxy Analyzer", description="Proxy request lookup.")
     proxy_analysis = ipv4_observable.add_analysis(type=proxy_analysis_type, summary="Found 1 user.")
     user_observable = proxy_analysis.add_observable(
-        "user", "johnclicker", datetime.datetime(2021, 1, 1, 0, 0, 0, tzinfo=pytz.utc)
+        "user", "johnclicker", datetime.datetime(2021, 1, 1, 0, 0, 0, tzinfo=datetime.timezone.utc)
     )
     user_observable.add_detection_point("clicker")
     user_observable.add_directive("SCOLD_EMPLOYEE")
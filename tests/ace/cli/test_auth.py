@@ -1,23 +1,11 @@
 from ace.constants import ACE_ADMIN_PASSWORD
-from ace.env import ACEOperatingEnvironment
+from ace.env import ACEOperatingEnvironment, get_system
 
 TEST_PASSWORD = "test"
 
 import pytest
 
 
-@pytest.fixture(scope="function")
-async def initialize_crypto():
-    encryption_settings = await initialize_encryption_settings(TEST_PASSWORD)
-    system = await get_system()
-
-    verification_key_encoded = base64.b64encode(system.encryption_settings.verification_key).decode()
-    salt_encoded = base64.b64encode(system.encryption_settings.salt).decode()
-    salt_size_encoded = str(system.encryption_settings.salt_size)
-    iterations_encoded = str(system.encryption_settings.iterations)
-    encrypted_key_encoded = base64.b64encode(system.encryption_settings.encrypted_key).decode()
-
-
 @pytest.mark.asyncio
 @pytest.mark.integration
 async def test_create_api_key(monkeypatch, capsys):
@@ -31,7 +19,15 @@ async def test_create_api_key(monkeypatch, capsys):
     # grab the api key we got from stdout
     api_key = captured.out.strip()
 
-    environment = ACEOperatingEnvironment(["api-key", "list"])
+    system = await get_system()
+    (key,) = await system.get_api_keys()
+    assert key.name == "test_key_1"
+    assert key.description == "automation functional key"
+    assert key.is_admin
+    assert await system.verify_api_key(api_key, is_admin=True)
+
+    # reuse the environment for the other commands instead of loading the packages again
+    environment.args = environment.parser.parse_args(["api-key", "list"])
     assert await environment.execute()
     captured = capsys.readouterr()
 
@@ -39,27 +35,28 @@ async def test_create_api_key(monkeypatch, capsys):
     assert "automation functional key" in captured.out
     assert "(admin)" in captured.out
 
-    environment = ACEOperatingEnvironment(["api-key", "delete", "test_key_1"])
+    environment.args = environment.parser.parse_args(["api-key", "delete", "test_key_1"])
     assert await environment.execute()
     captured = capsys.readouterr()
 
     assert "key deleted" in captured.out
+    assert not await system.get_api_keys()
 
     # make sure non-admin keys can be created
-    environment = ACEOperatingEnvironment(
+    environment.args = environment.parser.parse_args(
         ["api-key", "create", "test_key_1", "--description", "automation functional key"]
     )
     assert await environment.execute()
-    environment = ACEOperatingEnvironment(["api-key", "list"])
-    assert await environment.execute()
-    captured = capsys.readouterr()
+    capsys.readouterr()
 
-    assert "test_key_1" in captured.out
-    assert "(admin)" not in captured.out
+    (key,) = await system.get_api_keys()
+    assert key.name == "test_key_1"
+    assert not key.is_admin
 
     # test deleting an unknown key
-    environment = ACEOperatingEnvironment(["api-key", "delete", "test_key_2"])
+    environment.args = environment.parser.parse_args(["api-key", "delete", "test_key_2"])
     assert await environment.execute()
     captured = capsys.readouterr()
 
     assert "key not found" in captured.out
+    assert len(await system.get_api_keys()) == 1
@@ -2,6 +2,7 @@
 #
 
 import asyncio
+import functools
 import logging
 import os
 
@@ -9,23 +10,6 @@ import pytest
 
 import ace.crypto
 import ace.env
-import ace.system.distributed
-
-from ace.logging import get_logger
-from ace.system.distributed import app
-
-from tests.systems import (
-    ThreadedACETestSystem,
-    DatabaseACETestSystem,
-    RedisACETestSystem,
-    RemoteACETestSystem,
-    DistributedACETestSystem,
-)
-
-# from docker import DockerClient
-# from yellowbox.extras.redis import RedisService
-
-from redislite import Redis
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -45,39 +29,111 @@ def initialize_env_vars():
         "ACE_CRYPTO_VERIFICATION_KEY",
         "ACE_ADMIN_PASSWORD",
     ]:
-        try:
-            del os.environ[var]
-        except KeyError:
-            pass
+        os.environ.pop(var, None)
 
 
 @pytest.fixture(autouse=True, scope="session")
 def initialize_logging():
     logging.getLogger("redislite").setLevel(logging.WARNING)
-    logging.getLogger().setLevel(logging.DEBUG)
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+    # debug logging is expensive in the hot paths so it has to be asked for (ACE_TEST_LOG_LEVEL=DEBUG)
+    # the level is also set on the ace logger because loading the logging config resets the root logger
+    log_level = os.environ.get("ACE_TEST_LOG_LEVEL", "WARNING").upper()
+    logging.getLogger().setLevel(log_level)
+    logging.getLogger("ace").setLevel(log_level)
+
+
+@pytest.fixture(autouse=True, scope="function")
+def enable_debug_logs(request):
+    # tests marked with @pytest.mark.debug_logs get debug logging regardless of ACE_TEST_LOG_LEVEL
+    if request.node.get_closest_marker("debug_logs") is None:
+        yield
+        return
+
+    loggers = [logging.getLogger(), logging.getLogger("ace")]
+    levels = [_.level for _ in loggers]
+    for logger in loggers:
+        logger.setLevel(logging.DEBUG)
+
+    yield
+
+    for logger, level in zip(loggers, levels):
+        logger.setLevel(level)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def lower_crypto_iterations():
+    # test only: the key derivation is slow and the tests do not need strong keys
+    # yields the production default so tests can still check it
+    default_iterations = ace.crypto.DEFAULT_ITERATIONS
+    ace.crypto.DEFAULT_ITERATIONS = 1000
+    yield default_iterations
+    ace.crypto.DEFAULT_ITERATIONS = default_iterations
 
 
 @pytest.fixture(scope="session")
 def event_loop():
-    loop = asyncio.get_event_loop_policy().new_event_loop()
+    # use uvloop if it's available, the tests spend most of their time in the event loop
+    try:
+        import uvloop
+
+        loop = uvloop.new_event_loop()
+    except ImportError:
+        loop = asyncio.get_event_loop_policy().new_event_loop()
+
     yield loop
     loop.close()
 
 
+@pytest.fixture(autouse=True, scope="session")
+def test_data_dir(tmp_path_factory):
+    """Returns the directory that redis and the distributed system keep their files in during testing."""
+    from tests.systems import ENV_TEST_DATA_DIR
+
+    # pytest gives each pytest-xdist worker its own base temporary directory
+    path = tmp_path_factory.mktemp("data")
+    os.environ[ENV_TEST_DATA_DIR] = str(path)
+    yield path
+    os.environ.pop(ENV_TEST_DATA_DIR, None)
+
+
 @pytest.fixture(scope="session")
-def redis():
+def redis(test_data_dir):
+    # imported here so that tests that do not use redis do not pay for loading it
+    from redislite import Redis
+
     try:
-        redis_connection = Redis("ace.rdb")
+        # each pytest-xdist worker gets its own redis server
+        redis_connection = Redis(str(test_data_dir / "ace.rdb"))
+        # the tests flush redis all the time so there is no reason to write snapshots to disk
+        # (this is set at runtime because redislite reuses the server if it is already running)
+        redis_connection.config_set("save", "")
         yield redis_connection
     finally:
         redis_connection.close()
 
 
+@pytest.fixture(scope="session")
+def redis_url(redis):
+    """Returns the URL to use to connect to the test redis instance."""
+    return "unix://{}".format(redis.connection_pool.connection_kwargs["path"])
+
+
+@functools.lru_cache(maxsize=1)
+def _empty_env() -> ace.env.ACEOperatingEnvironment:
+    """Returns the env with no arguments passed in. It is only built once since building it loads the packages."""
+    return ace.env.ACEOperatingEnvironment([])
+
+
 @pytest.fixture(scope="function", autouse=True)
 def ace_env(monkeypatch, tmp_path):
     # register a global env with no arguments passed in
-    ace.env.register_global_env(ace.env.ACEOperatingEnvironment([]))
+    env = ace.env.register_global_env(_empty_env())
+    packages = list(env.package_manager.packages)
     # ensure that we use a temporary directory as the base directory for testing
     monkeypatch.setenv("ACE_BASE_DIR", str(tmp_path))
-    yield  # XXX don't need this last part
+    yield
+    # undo whatever the test changed on the shared env
+    env.set_system(None)
+    env.package_manager.packages = packages
     ace.env.ACE_ENV = None
@@ -1,29 +1,26 @@
 # vim: ts=4:sw=4:et:cc=120
 #
 
-import os.path
-import os
+from pathlib import Path
 
-from ace.crypto import initialize_encryption_settings
 from ace.module.manager import AnalysisModuleManager, CONCURRENCY_MODE_PROCESS, CONCURRENCY_MODE_THREADED
 from ace.logging import get_logger
 from ace.system.distributed import app
 
-from tests.systems import DistributedACETestSystem, RemoteACETestSystem, RemoteACETestSystemProcess
+from tests.systems import (
+    DistributedACETestSystem,
+    RemoteACETestSystem,
+    RemoteACETestSystemProcess,
+    get_test_encryption_settings,
+)
 
 import pytest
 
 
-@pytest.fixture(scope="session")
-def redis_url(redis):
-    """Returns the URL to use to connect to the test redis instance."""
-    return "unix://{}".format(redis.connection_pool.connection_kwargs["path"])
+@pytest.fixture(scope="module")
+async def distributed_system(redis_url):
+    """The "server side" system shared by all the tests in a module."""
 
-
-@pytest.fixture(scope="function", params=[CONCURRENCY_MODE_THREADED, CONCURRENCY_MODE_PROCESS])
-async def manager(request, redis, redis_url, tmpdir):
-
-    # initialize the "server side" system
     app.state.system = DistributedACETestSystem()
     from ace.system.redis import CONFIG_REDIS_HOST, CONFIG_REDIS_PORT
 
@@ -31,22 +28,44 @@ async def manager(request, redis, redis_url, tmpdir):
     await app.state.system.set_config(CONFIG_REDIS_HOST, redis_url)
 
     # initialize encryption settings with a password of "test"
-    app.state.system.encryption_settings = await initialize_encryption_settings("test")
-    app.state.system.encryption_settings.load_aes_key("test")
+    app.state.system.encryption_settings = await get_test_encryption_settings("test")
 
     # set the storage root for the local file system storage
     # app.state.system.storage_root = str(tmpdir)
 
     await app.state.system.initialize()
-    await app.state.system.reset()  # XXX do we need this here?
+    await app.state.system.reset()
+    await app.state.system.start()
+
+    yield app.state.system
+
+    # stop the distributed system on the "server" side
+    await app.state.system.stop()
+
+    # blast away the database
+    Path(app.state.system.db_path).unlink(missing_ok=True)
+
+    # drop the reference to the distributed system on the "server" side
+    # this will force this to be recreated for the next module
+    delattr(app.state, "system")
 
-    app.state.system.root_api_key = (
-        await app.state.system.create_api_key("test_root", "test_root", is_admin=True)
+
+# process mode spawns new processes for every test so it is marked slow
+# use -m "(unit or integration or system) and not slow" to skip it
+@pytest.fixture(
+    scope="function",
+    params=[CONCURRENCY_MODE_THREADED, pytest.param(CONCURRENCY_MODE_PROCESS, marks=pytest.mark.slow)],
+)
+async def manager(request, distributed_system, redis_url):
+
+    # reset the "server side" system back to the initial state (this also clears redis)
+    await distributed_system.reset()
+    distributed_system.root_api_key = (
+        await distributed_system.create_api_key("test_root", "test_root", is_admin=True)
     ).api_key
-    await app.state.system.start()
 
     # initialize the "client side" system
-    system = RemoteACETestSystem(app.state.system.root_api_key)
+    system = RemoteACETestSystem(distributed_system.root_api_key)
     await system.initialize()
     await system.start()
 
@@ -79,16 +98,5 @@ async def manager(request, redis, redis_url, tmpdir):
 
     yield _manager
 
-    # stop the distributed system on the "server" side
-    await app.state.system.stop()
-
-    # reset redis to default state
-    redis.flushall()
-
-    # blast away the database
-    if os.path.exists("ace_distributed.db"):
-        os.remove("ace_distributed.db")
-
-    # drop the reference to the distributed system on the "server" side
-    # this will force this to be recreated every time
-    delattr(app.state, "system")
+    # stop the "client" side
+    await system.stop()
@@ -2,10 +2,16 @@
 #
 
 import asyncio
+import multiprocessing
+import multiprocessing.synchronize
 import os
 import os.path
-import tempfile
 import shutil
+import signal
+import tempfile
+import time
+
+from typing import Optional
 
 import ace.analysis
 
@@ -16,10 +22,29 @@ from ace.system.distributed import app
 from ace.system.events import EventHandler, Event
 from ace.module.base import AnalysisModule, MultiProcessAnalysisModule
 from ace.module.manager import AnalysisModuleManager, CONCURRENCY_MODE_PROCESS, CONCURRENCY_MODE_THREADED
-from tests.systems import RemoteACETestSystem
+from tests.systems import RemoteACETestSystem, RemoteACETestSystemProcess
 
 import pytest
 
+# tests that wait on another task to stop the manager fail after this many seconds instead of hanging
+MANAGER_RUN_TIMEOUT = 5
+
+
+async def submit_test_root(manager: AnalysisModuleManager) -> tuple[RootAnalysis, Observable]:
+    """Submits a new root with a single test observable for analysis."""
+    root = manager.system.new_root()
+    observable = root.add_observable("test", "test")
+    await root.submit()
+    return root, observable
+
+
+async def get_test_analysis(
+    manager: AnalysisModuleManager, root: RootAnalysis, observable: Observable, amt: AnalysisModuleType
+) -> Optional[Analysis]:
+    """Returns the analysis the given module type produced for the observable, as currently stored in the core."""
+    root = await manager.system.get_root_analysis(root)
+    return root.get_observable(observable).get_analysis(amt)
+
 
 @pytest.mark.asyncio
 @pytest.mark.system
@@ -43,17 +68,13 @@ async def test_basic_analysis_async(manager):
     await manager.system.register_analysis_module_type(module.type)
 
     # submit a root for analysis so we create a new job
-    root = manager.system.new_root()
-    observable = root.add_observable("test", "test")
-    await root.submit()
+    root, observable = await submit_test_root(manager)
 
     manager.add_module(module)
     await manager.run_once()
 
     # check the results in the core
-    root = await manager.system.get_root_analysis(root)
-    observable = root.get_observable(observable)
-    analysis = observable.get_analysis(module.type)
+    analysis = await get_test_analysis(manager, root, observable, module.type)
     assert analysis
     assert await analysis.get_details() == {"test": "test"}
     assert analysis.observables[0] == ace.analysis.Observable("test", "hello")
@@ -85,18 +106,14 @@ async def test_basic_analysis_sync(manager):
     await manager.system.register_analysis_module_type(module.type)
 
     # submit a root for analysis so we create a new job
-    root = manager.system.new_root()
-    observable = root.add_observable("test", "test")
-    await root.submit()
+    root, observable = await submit_test_root(manager)
 
     # create a new manager to run our analysis modules
     manager.add_module(module)
     await manager.run_once()
 
     # check the results in the core
-    root = await manager.system.get_root_analysis(root)
-    observable = root.get_observable(observable)
-    analysis = observable.get_analysis(module.type)
+    analysis = await get_test_analysis(manager, root, observable, module.type)
     assert analysis
     assert await analysis.get_details() == {"test": "test"}
     assert analysis.observables[0] == ace.analysis.Observable("test", "hello")
@@ -105,16 +122,11 @@ async def test_basic_analysis_sync(manager):
 @pytest.mark.asyncio
 @pytest.mark.integration
 async def test_force_stop_stuck_async_task(manager):
-    control = asyncio.Event()
-
     class CustomAnalysisModule(AnalysisModule):
         async def execute_analysis(self, root, observable, analysis):
-            nonlocal control
-            control.set()
-            # get stuck
-            import sys
-
-            await asyncio.sleep(sys.maxsize)
+            # stop the manager from inside the module and then get stuck (this future never completes)
+            manager.force_stop()
+            await asyncio.get_running_loop().create_future()
 
     # register the type to the core
     amt = AnalysisModuleType("test", "")
@@ -123,29 +135,30 @@ async def test_force_stop_stuck_async_task(manager):
     module = CustomAnalysisModule(amt)
     manager.add_module(module)
 
-    root = manager.system.new_root()
-    observable = root.add_observable("test", "test")
-    await root.submit()
-
-    async def _cancel():
-        nonlocal control
-        nonlocal manager
-        await control.wait()
-        manager.force_stop()
+    root, observable = await submit_test_root(manager)
 
-    cancel_task = asyncio.get_event_loop().create_task(_cancel())
-    await manager.run()
-    await cancel_task
+    await asyncio.wait_for(manager.run(), timeout=MANAGER_RUN_TIMEOUT)
 
 
 class StuckAnalysisModule(MultiProcessAnalysisModule):
-    async def execute_analysis(self, root, observable, analysis):
-        # get stuck
-        import time, sys
+    # set in the worker process by StuckRemoteACETestSystemProcess
+    stuck_event: Optional[multiprocessing.synchronize.Event] = None
 
+    async def execute_analysis(self, root, observable, analysis):
+        # let the test know the job made it into the executor and then get stuck
+        self.stuck_event.set()
         time.sleep(1000)
 
 
+class StuckRemoteACETestSystemProcess(RemoteACETestSystemProcess):
+    """Hands the event of the test to the StuckAnalysisModule in the worker process.
+    The event comes in with the initializer arguments of the executor so it works however the worker is started."""
+
+    def __init__(self, *args, stuck_event: multiprocessing.synchronize.Event, **kwargs):
+        super().__init__(*args, **kwargs)
+        StuckAnalysisModule.stuck_event = stuck_event
+
+
 @pytest.mark.asyncio
 @pytest.mark.integration
 async def test_force_stop_stuck_sync_task(manager):
@@ -160,19 +173,17 @@ async def test_force_stop_stuck_sync_task(manager):
     module = StuckAnalysisModule(amt)
     manager.add_module(module)
 
-    root = manager.system.new_root()
-    observable = root.add_observable("test", "test")
-    await root.submit()
+    root, observable = await submit_test_root(manager)
 
-    async def _cancel():
-        nonlocal manager
-        manager.force_stop()
+    stuck_event = multiprocessing.Event()
+    manager.system_cls = StuckRemoteACETestSystemProcess
+    manager.system_cls_kwargs = {"stuck_event": stuck_event}
 
-    manager_task = asyncio.get_event_loop().create_task(manager.run())
-    await asyncio.wait([manager_task], timeout=0.01)
-    cancel_task = asyncio.get_event_loop().create_task(_cancel())
-    await manager_task
-    await cancel_task
+    manager_task = asyncio.create_task(manager.run())
+    # wait for the worker process to actually get stuck before stopping the manager
+    assert await asyncio.get_running_loop().run_in_executor(None, stuck_event.wait, MANAGER_RUN_TIMEOUT)
+    manager.force_stop()
+    await asyncio.wait_for(manager_task, timeout=MANAGER_RUN_TIMEOUT)
 
 
 @pytest.mark.asyncio
@@ -188,15 +199,11 @@ async def test_raised_exception_during_async_analysis(manager):
     module = CustomAnalysisModule(amt)
     manager.add_module(module)
 
-    root = manager.system.new_root()
-    observable = root.add_observable("test", "test")
-    await root.submit()
+    root, observable = await submit_test_root(manager)
 
     await manager.run_once()
 
-    root = await manager.system.get_root_analysis(root)
-    observable = root.get_observable(observable)
-    analysis = observable.get_analysis(amt)
+    analysis = await get_test_analysis(manager, root, observable, amt)
 
     assert analysis.error_message == "testv1.0.0 failed analyzing type test value test: failure"
     assert analysis.stack_trace
@@ -216,15 +223,11 @@ async def test_raised_exception_during_sync_analysis(manager):
     module = FailingAnalysisModule(amt)
     manager.add_module(module)
 
-    root = manager.system.new_root()
-    observable = root.add_observable("test", "test")
-    await root.submit()
+    root, observable = await submit_test_root(manager)
 
     await manager.run_once()
 
-    root = await manager.system.get_root_analysis(root)
-    observable = root.get_observable(observable)
-    analysis = observable.get_analysis(amt)
+    analysis = await get_test_analysis(manager, root, observable, amt)
 
     assert analysis.error_message == "testv1.0.0 failed analyzing type test value test: failure"
     assert analysis.stack_trace
@@ -232,8 +235,6 @@ async def test_raised_exception_during_sync_analysis(manager):
 
 class CrashingAnalysisModule(MultiProcessAnalysisModule):
     async def execute_analysis(self, root, observable, analysis):
-        import os, signal
-
         if observable.value == "crash":
             os.kill(os.getpid(), signal.SIGKILL)
         else:
@@ -266,8 +267,10 @@ async def test_crashing_sync_analysis_module(manager):
 
     amt_crashing = AnalysisModuleType("crash_test", "")
     amt_ok = AnalysisModuleType("ok", "")
-    await manager.system.register_analysis_module_type(amt_crashing)
-    await manager.system.register_analysis_module_type(amt_ok)
+    await asyncio.gather(
+        manager.system.register_analysis_module_type(amt_crashing),
+        manager.system.register_analysis_module_type(amt_ok),
+    )
 
     # this is only supported in CONCURRENCY_MODE_PROCESS
     crashing_module = CrashingAnalysisModule(amt_crashing)
@@ -285,9 +288,7 @@ async def test_crashing_sync_analysis_module(manager):
     # wait for analysis to complete
     assert await sync.wait()
 
-    root = await manager.system.get_root_analysis(root)
-    observable = root.get_observable(observable)
-    analysis = observable.get_analysis(amt_crashing)
+    analysis = await get_test_analysis(manager, root, observable, amt_crashing)
 
     assert analysis.error_message == "crash_testv1.0.0 process crashed when analyzing type test value crash"
     assert analysis.stack_trace
@@ -332,9 +333,7 @@ async def test_upgraded_version_analysis_module(manager):
     module = CustomAnalysisModule(type=amt)
     manager.add_module(module)
 
-    root = manager.system.new_root()
-    observable = root.add_observable("test", "test")
-    await root.submit()
+    root, observable = await submit_test_root(manager)
 
     root_2 = manager.system.new_root()
     observable_2 = root_2.add_observable("test", "test")
@@ -348,7 +347,7 @@ async def test_upgraded_version_analysis_module(manager):
         await root_2.submit()
 
     upgrade_task = asyncio.create_task(_upgrade())
-    await manager.run()
+    await asyncio.wait_for(manager.run(), timeout=MANAGER_RUN_TIMEOUT)
     await upgrade_task
 
     # in this case the version mismatch just causes the manger to exit
@@ -392,9 +391,7 @@ async def test_upgraded_extended_version_async_analysis_module(manager):
     module = CustomAnalysisModule(type=amt)
     manager.add_module(module)
 
-    root = manager.system.new_root()
-    observable = root.add_observable("test", "test")
-    await root.submit()
+    root, observable = await submit_test_root(manager)
 
     root_2 = manager.system.new_root()
     observable_2 = root_2.add_observable("test", "test")
@@ -416,7 +413,7 @@ async def test_upgraded_extended_version_async_analysis_module(manager):
 
     upgrade_task = asyncio.create_task(_update_intel())
     shutdown_task = asyncio.create_task(_shutdown())
-    await manager.run()
+    await asyncio.wait_for(manager.run(), timeout=MANAGER_RUN_TIMEOUT)
     await upgrade_task
     await shutdown_task
 
@@ -485,7 +482,7 @@ async def test_upgraded_extended_version_sync_analysis_module(concurrency_mode,
         await root.submit()
 
     upgrade_task = asyncio.create_task(_update_intel())
-    await custom_manager.run()
+    await asyncio.wait_for(custom_manager.run(), timeout=MANAGER_RUN_TIMEOUT)
     await upgrade_task
     await root_analysis_completed.wait()
 
@@ -539,18 +536,14 @@ async def test_async_module_timeout(manager):
     await manager.system.register_analysis_module_type(module.type)
 
     # submit a root for analysis so we create a new job
-    root = manager.system.new_root()
-    observable = root.add_observable("test", "test")
-    await root.submit()
+    root, observable = await submit_test_root(manager)
 
     # create a new manager to run our analysis modules
     manager.add_module(module)
     await manager.run_once()
 
     # check the results in the core
-    root = await manager.system.get_root_analysis(root)
-    observable = root.get_observable(observable)
-    analysis = observable.get_analysis(module.type)
+    analysis = await get_test_analysis(manager, root, observable, module.type)
     assert analysis
     assert analysis.error_message == "testv1.0.0 timed out analyzing type test value test after 0 seconds"
 
@@ -585,18 +578,14 @@ async def test_module_add_file(manager, tmpdir, module_class):
     await manager.system.register_analysis_module_type(module.type)
 
     # submit a root for analysis so we create a new job
-    root = manager.system.new_root()
-    observable = root.add_observable("test", "test")
-    await root.submit()
+    root, observable = await submit_test_root(manager)
 
     # create a new manager to run our analysis modules
     manager.add_module(module)
     await manager.run_once()
 
     # check the results in the core
-    root = await manager.system.get_root_analysis(root)
-    observable = root.get_observable(observable)
-    analysis = observable.get_analysis(module.type)
+    analysis = await get_test_analysis(manager, root, observable, module.type)
     assert analysis
     file_observable = analysis.get_observable_by_type("file")
     assert file_observable
@@ -647,9 +636,7 @@ async def test_analyze_file_observable(manager, tmpdir):
     await manager.run_once()
 
     # check the results in the core
-    root = await manager.system.get_root_analysis(root)
-    observable = root.get_observable(observable)
-    analysis = observable.get_analysis(module.type)
+    analysis = await get_test_analysis(manager, root, observable, module.type)
     assert analysis
     details = await analysis.get_details()
     assert details["result"] is True
@@ -668,8 +655,6 @@ async def test_analyze_file_observable(manager, tmpdir):
     await manager.run_once()
 
     # check the results in the core
-    root = await manager.system.get_root_analysis(root)
-    observable = root.get_observable(observable)
-    analysis = observable.get_analysis(module.type)
+    analysis = await get_test_analysis(manager, root, observable, module.type)
     assert analysis
     assert analysis.error_message == "unknown file"
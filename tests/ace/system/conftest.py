@@ -1,9 +1,13 @@
 # vim: ts=4:sw=4:et:cc=120
 #
 
-from ace.crypto import initialize_encryption_settings
-
-from tests.systems import DatabaseACETestSystem, RedisACETestSystem, RemoteACETestSystem, DistributedACETestSystem
+from tests.systems import (
+    DatabaseACETestSystem,
+    RedisACETestSystem,
+    RemoteACETestSystem,
+    DistributedACETestSystem,
+    get_test_encryption_settings,
+)
 
 import pytest
 
@@ -16,8 +20,7 @@ import pytest
         "remote",
     ],
 )
-async def system(request, redis):
-    import ace.crypto
+async def system(request, redis_url):
     from ace.system.distributed import app
     from ace.system.redis import CONFIG_REDIS_HOST, CONFIG_REDIS_PORT
 
@@ -28,21 +31,14 @@ async def system(request, redis):
     elif request.param == "redis":
         test_system = RedisACETestSystem()
 
-        # pull the unix path from the redislist connection pool
-        await test_system.set_config(
-            CONFIG_REDIS_HOST, "unix://{}".format(redis.connection_pool.connection_kwargs["path"])
-        )
+        await test_system.set_config(CONFIG_REDIS_HOST, redis_url)
     elif request.param == "remote":
         app.state.system = DistributedACETestSystem()
 
         # initialize encryption settings with a password of "test"
-        app.state.system.encryption_settings = await ace.crypto.initialize_encryption_settings("test")
-        app.state.system.encryption_settings.load_aes_key("test")
+        app.state.system.encryption_settings = await get_test_encryption_settings("test")
 
-        # pull the unix path from the redislist connection pool
-        await app.state.system.set_config(
-            CONFIG_REDIS_HOST, "unix://{}".format(redis.connection_pool.connection_kwargs["path"])
-        )
+        await app.state.system.set_config(CONFIG_REDIS_HOST, redis_url)
 
         await app.state.system.initialize()
         await app.state.system.reset()
@@ -52,8 +48,7 @@ async def system(request, redis):
         test_system = RemoteACETestSystem(api_key=root_api_key.api_key)
 
     # initialize encryption settings with a password of "test"
-    test_system.encryption_settings = await initialize_encryption_settings("test")
-    test_system.encryption_settings.load_aes_key("test")
+    test_system.encryption_settings = await get_test_encryption_settings("test")
 
     await test_system.initialize()
     await test_system.start()
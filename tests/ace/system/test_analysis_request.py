@@ -194,6 +194,33 @@ async def test_process_expired_analysis_request(system):
     assert not await system.get_expired_analysis_requests()
 
 
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_process_expired_analysis_request_multiple(system):
+    # set the requests to time out immediately
+    amt = AnalysisModuleType(name="test", description="test", version="1.0.0", timeout=0, cache_ttl=600)
+    await system.register_analysis_module_type(amt)
+    await system.add_work_queue(amt.name)
+
+    root = system.new_root()
+    requests = []
+    for value in [TEST_1, TEST_2]:
+        request = root.add_observable("test", value).create_analysis_request(amt)
+        request.status = TRACKING_STATUS_ANALYZING
+        await system.track_analysis_request(request)
+        requests.append(request)
+
+    assert len(await system.get_expired_analysis_requests()) == 2
+    assert await system.process_expired_analysis_requests(amt) == 2
+    for request in requests:
+        assert (await system.get_analysis_request_by_request_id(request.id)).status == TRACKING_STATUS_QUEUED
+
+    assert not await system.get_expired_analysis_requests()
+    assert await system.get_queue_size(amt) == 2
+    # nothing is left to move
+    assert not await system.process_expired_analysis_requests(amt)
+
+
 @pytest.mark.asyncio
 @pytest.mark.integration
 async def test_process_expired_analysis_request_invalid_work_queue(system):
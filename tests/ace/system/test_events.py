@@ -245,3 +245,13 @@ async def test_get_event_handlers(system):
     handler = TestEventHandler()
     await system.register_event_handler("test", handler)
     assert len(await system.get_event_handlers("test")) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_get_event_handlers_copy(system):
+    handler = TestEventHandler()
+    await system.register_event_handler("test", handler)
+    # changing the returned list does not change the registered handlers
+    (await system.get_event_handlers("test")).clear()
+    assert await system.get_event_handlers("test") == [handler]
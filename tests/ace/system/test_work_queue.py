@@ -1,5 +1,6 @@
 # vim: ts=4:sw=4:et:cc=120
 
+import time
 import uuid
 
 import pytest
@@ -7,7 +8,10 @@ import pytest
 from ace.analysis import RootAnalysis, AnalysisModuleType
 from ace.system.requests import AnalysisRequest
 from ace.constants import *
-from ace.exceptions import UnknownAnalysisModuleTypeError
+from ace.exceptions import UnknownAnalysisModuleTypeError, AnalysisModuleTypeVersionError
+from ace.system.distributed import app
+
+from tests.systems import RemoteACETestSystem
 
 amt_1 = AnalysisModuleType(name="test", description="test", version="1.0.0", timeout=30, cache_ttl=600)
 
@@ -127,3 +131,149 @@ async def test_get_next_analysis_request_deleted(system):
 
     # should be nothing there to get since the request was deleted
     assert await system.get_next_analysis_request("owner", amt, 0) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_get_next_analysis_requests(system):
+    await system.register_analysis_module_type(amt_1)
+    root = system.new_root()
+    requests = []
+    for index in range(3):
+        observable = root.add_observable("test", f"{TEST_1}_{index}")
+        request = AnalysisRequest(system, root, observable, amt_1)
+        await system.queue_analysis_request(request)
+        requests.append(request)
+
+    # ask for fewer than what is available
+    next_ars = await system.get_next_analysis_requests(TEST_OWNER, amt_1, 2, 0)
+    assert next_ars == requests[:2]
+    for next_ar in next_ars:
+        assert next_ar.status == TRACKING_STATUS_ANALYZING
+        assert next_ar.owner == TEST_OWNER
+
+    # ask for more than what is available
+    assert await system.get_next_analysis_requests(TEST_OWNER, amt_1, 2, 0) == requests[2:]
+    assert await system.get_next_analysis_requests(TEST_OWNER, amt_1, 2, 0) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_get_next_analysis_request_for(system):
+    await system.register_analysis_module_type(amt_1)
+    get_next_analysis_request = system.get_next_analysis_request_for(TEST_OWNER, amt_1)
+    assert await get_next_analysis_request() is None
+
+    root = system.new_root()
+    observable = root.add_observable("test", TEST_1)
+    request = AnalysisRequest(system, root, observable, amt_1)
+    await system.queue_analysis_request(request)
+
+    next_ar = await get_next_analysis_request(0)
+    assert next_ar == request
+    assert next_ar.owner == TEST_OWNER
+    assert next_ar.status == TRACKING_STATUS_ANALYZING
+    assert await get_next_analysis_request() is None
+
+    # the version is still checked on every call
+    await system.register_analysis_module_type(
+        AnalysisModuleType(name="test", description="test", version="1.0.1", timeout=30, cache_ttl=600)
+    )
+    with pytest.raises(AnalysisModuleTypeVersionError):
+        await get_next_analysis_request()
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_get_next_analysis_request_already_claimed(system):
+    await system.register_analysis_module_type(amt_1)
+    root = system.new_root()
+    observable = root.add_observable("test", TEST_1)
+    request = AnalysisRequest(system, root, observable, amt_1)
+    await system.queue_analysis_request(request)
+
+    # the same request ends up in the work queue twice
+    await system.put_work(amt_1, request)
+
+    next_ar = await system.get_next_analysis_request(TEST_OWNER, amt_1, 0)
+    assert next_ar == request
+    assert next_ar.owner == TEST_OWNER
+
+    # the second copy is skipped since the request is already claimed
+    assert await system.get_next_analysis_request("other", amt_1, 0) is None
+    assert (await system.get_analysis_request_by_request_id(request.id)).owner == TEST_OWNER
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_get_next_analysis_request_cached_amt_upgraded(system):
+    await system.register_analysis_module_type(amt_1)
+    # this caches the registered type
+    assert await system.get_next_analysis_request(TEST_OWNER, amt_1, 0) is None
+
+    # upgrading the type invalidates the cached copy right away
+    amt_upgraded = AnalysisModuleType(name="test", description="test", version="1.0.1")
+    await system.register_analysis_module_type(amt_upgraded)
+    with pytest.raises(AnalysisModuleTypeVersionError):
+        await system.get_next_analysis_request(TEST_OWNER, amt_1, 0)
+
+    assert await system.get_next_analysis_request(TEST_OWNER, amt_upgraded, 0) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_get_next_analysis_request_stale_cached_amt(system):
+    # the remote system does the version checks on the server side
+    target = app.state.system if isinstance(system, RemoteACETestSystem) else system
+    amt_upgraded = AnalysisModuleType(name="test", description="test", version="1.0.1")
+    await target.register_analysis_module_type(amt_upgraded)
+
+    # simulate the cache still holding the old version after another process upgraded the type
+    target._amt_cache = {amt_1.name: (time.monotonic(), amt_1)}
+
+    # the mismatch is confirmed against the registered type instead of failing the request
+    assert await target.get_next_analysis_request(TEST_OWNER, amt_upgraded, 0) is None
+    with pytest.raises(AnalysisModuleTypeVersionError):
+        await target.get_next_analysis_request(TEST_OWNER, amt_1, 0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_get_next_analysis_request_expired_interval(system, monkeypatch):
+    amt = AnalysisModuleType(name="test", description="test", version="1.0.0", timeout=0, cache_ttl=600)
+    await system.register_analysis_module_type(amt)
+    root = system.new_root()
+    observable = root.add_observable("test", TEST_1)
+    request = AnalysisRequest(system, root, observable, amt)
+    await system.queue_analysis_request(request)
+
+    # the expired requests are checked at most once per interval
+    target = app.state.system if isinstance(system, RemoteACETestSystem) else system
+    monkeypatch.setattr(target, "expired_analysis_request_interval", 600)
+    assert await system.get_next_analysis_request(TEST_OWNER, amt, 0) == request
+    # the request has expired but it has not been that long since the last check
+    assert await system.get_next_analysis_request(TEST_OWNER, amt, 0) is None
+
+    monkeypatch.setattr(target, "expired_analysis_request_interval", 0)
+    assert await system.get_next_analysis_request(TEST_OWNER, amt, 0) == request
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_get_work_batch(system):
+    # the remote system does not expose the work queues directly
+    target = app.state.system if isinstance(system, RemoteACETestSystem) else system
+    await target.add_work_queue(amt_1)
+    assert await target.get_work_batch(amt_1, 2, 0) == []
+
+    root = target.new_root()
+    requests = []
+    for index in range(3):
+        observable = root.add_observable("test", f"{TEST_1}_{index}")
+        request = AnalysisRequest(target, root, observable, amt_1)
+        await target.put_work(amt_1, request)
+        requests.append(request)
+
+    assert await target.get_work_batch(amt_1, 2, 0) == requests[:2]
+    assert await target.get_work_batch(amt_1, 2, 0) == requests[2:]
+    assert await target.get_queue_size(amt_1) == 0
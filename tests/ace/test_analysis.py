@@ -6,7 +6,6 @@ from ace.time import event_time_format_tz, event_time_format
 from tests.ace.test_time import mock_tz
 
 import pytest
-import pytz
 
 
 @pytest.mark.parametrize(
@@ -16,20 +15,23 @@ import pytz
         (None, None),
         # with UTC timezone
         (
-            datetime.datetime(2021, 12, 12, 1, 0, 0, tzinfo=pytz.utc),
-            datetime.datetime(2021, 12, 12, 1, 0, 0, tzinfo=pytz.utc),
+            datetime.datetime(2021, 12, 12, 1, 0, 0, tzinfo=datetime.timezone.utc),
+            datetime.datetime(2021, 12, 12, 1, 0, 0, tzinfo=datetime.timezone.utc),
         ),
         # without a timezone
-        (datetime.datetime(2021, 12, 12, 1, 0, 0), datetime.datetime(2021, 12, 12, 2, 0, 0, tzinfo=pytz.utc)),
+        (
+            datetime.datetime(2021, 12, 12, 1, 0, 0),
+            datetime.datetime(2021, 12, 12, 2, 0, 0, tzinfo=datetime.timezone.utc),
+        ),
         # string with UTC timezone
         (
-            datetime.datetime(2021, 12, 12, 1, 0, 0, tzinfo=pytz.utc).strftime(event_time_format_tz),
-            datetime.datetime(2021, 12, 12, 1, 0, 0, tzinfo=pytz.utc),
+            datetime.datetime(2021, 12, 12, 1, 0, 0, tzinfo=datetime.timezone.utc).strftime(event_time_format_tz),
+            datetime.datetime(2021, 12, 12, 1, 0, 0, tzinfo=datetime.timezone.utc),
         ),
         # string without timezone
         (
             datetime.datetime(2021, 12, 12, 1, 0, 0).strftime(event_time_format),
-            datetime.datetime(2021, 12, 12, 2, 0, 0, tzinfo=pytz.utc),
+            datetime.datetime(2021, 12, 12, 2, 0, 0, tzinfo=datetime.timezone.utc),
         ),
     ],
 )
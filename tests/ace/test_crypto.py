@@ -7,6 +7,8 @@ import os.path
 
 import aiofiles
 
+import ace.crypto
+
 from ace.crypto import (
     ENV_CRYPTO_ENCRYPTED_KEY,
     ENV_CRYPTO_ITERATIONS,
@@ -45,12 +47,22 @@ async def test_initialize_encryption_settings():
 
     settings = await initialize_encryption_settings("test")
     assert settings.salt_size == 32
-    assert settings.iterations == 8192
+    # the lower_crypto_iterations fixture lowers the default to 1000 for testing
+    assert settings.iterations == 1000
     assert isinstance(settings.encrypted_key, bytes)
     assert isinstance(settings.salt, bytes) and len(settings.salt) == settings.salt_size
     assert isinstance(settings.verification_key, bytes) and len(settings.verification_key) == 32
 
 
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_initialize_encryption_settings_default_iterations(monkeypatch, lower_crypto_iterations):
+    # put back the production default that the lower_crypto_iterations fixture replaced
+    monkeypatch.setattr(ace.crypto, "DEFAULT_ITERATIONS", lower_crypto_iterations)
+    settings = await initialize_encryption_settings("test")
+    assert settings.iterations == 8192
+
+
 @pytest.mark.unit
 def test_is_valid_password(settings):
     assert is_valid_password("test", settings)
@@ -4,7 +4,6 @@ import os.path
 import shutil
 
 import pytest
-import pytz
 
 from ace.analysis import RootAnalysis, AnalysisModuleType, Analysis, Observable
 from ace.time import utc_now, event_time_format_tz, event_time_format
@@ -57,20 +56,23 @@ def test_observable_eq():
         (None, None),
         # with UTC timezone
         (
-            datetime.datetime(2021, 12, 12, 1, 0, 0, tzinfo=pytz.utc),
-            datetime.datetime(2021, 12, 12, 1, 0, 0, tzinfo=pytz.utc),
+            datetime.datetime(2021, 12, 12, 1, 0, 0, tzinfo=datetime.timezone.utc),
+            datetime.datetime(2021, 12, 12, 1, 0, 0, tzinfo=datetime.timezone.utc),
         ),
         # without a timezone
-        (datetime.datetime(2021, 12, 12, 1, 0, 0), datetime.datetime(2021, 12, 12, 2, 0, 0, tzinfo=pytz.utc)),
+        (
+            datetime.datetime(2021, 12, 12, 1, 0, 0),
+            datetime.datetime(2021, 12, 12, 2, 0, 0, tzinfo=datetime.timezone.utc),
+        ),
         # string with UTC timezone
         (
-            datetime.datetime(2021, 12, 12, 1, 0, 0, tzinfo=pytz.utc).strftime(event_time_format_tz),
-            datetime.datetime(2021, 12, 12, 1, 0, 0, tzinfo=pytz.utc),
+            datetime.datetime(2021, 12, 12, 1, 0, 0, tzinfo=datetime.timezone.utc).strftime(event_time_format_tz),
+            datetime.datetime(2021, 12, 12, 1, 0, 0, tzinfo=datetime.timezone.utc),
         ),
         # string without timezone
         (
             datetime.datetime(2021, 12, 12, 1, 0, 0).strftime(event_time_format),
-            datetime.datetime(2021, 12, 12, 2, 0, 0, tzinfo=pytz.utc),
+            datetime.datetime(2021, 12, 12, 2, 0, 0, tzinfo=datetime.timezone.utc),
         ),
     ],
 )
@@ -99,7 +99,7 @@ class TestManagedBackgroundService(ACEService):
 async def test_start_stop_service():
     service = TestService()
     # start the service
-    task = asyncio.get_event_loop().create_task(service.start())
+    task = asyncio.create_task(service.start())
     # wait for it to start
     await service.service_executed.wait()
     # tell it to stop
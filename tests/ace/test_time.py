@@ -2,25 +2,32 @@
 
 import datetime
 
+import zoneinfo
+
 import ace.time
 from ace.time import parse_datetime_string, utc_now
 
-import tzlocal
 import pytest
-import pytz
 
 
 @pytest.fixture
 def mock_tz(monkeypatch):
-    def get_localzone(*args, **kwags):
-        return pytz.timezone("Etc/GMT+1")
-
-    monkeypatch.setattr(tzlocal, "get_localzone", get_localzone)
+    monkeypatch.setattr(ace.time, "LOCAL_TIMEZONE", zoneinfo.ZoneInfo("Etc/GMT+1"))
 
 
 @pytest.mark.unit
 def test_utc_now():
-    assert utc_now().tzinfo == pytz.utc
+    assert utc_now().tzinfo == datetime.timezone.utc
+
+
+@pytest.mark.unit
+def test_get_local_timezone_fallback(monkeypatch):
+    def _get_localzone():
+        raise zoneinfo.ZoneInfoNotFoundError("CST6")
+
+    # a local timezone that cannot be loaded by name falls back to the current UTC offset
+    monkeypatch.setattr(ace.time.tzlocal, "get_localzone", _get_localzone)
+    assert ace.time._get_local_timezone() == datetime.datetime.now().astimezone().tzinfo
 
 
 @pytest.mark.unit
@@ -39,7 +46,7 @@ def test_parse_datetime_string(mock_tz):
     assert result.hour == 14
     assert result.minute == 6
     assert result.second == 34
-    assert result.tzinfo == pytz.utc
+    assert result.tzinfo == datetime.timezone.utc
 
     result = parse_datetime_string(old_default_format)
     assert result.year == 2018
@@ -48,7 +55,7 @@ def test_parse_datetime_string(mock_tz):
     assert result.hour == 15
     assert result.minute == 6
     assert result.second == 34
-    assert result.tzinfo == pytz.utc
+    assert result.tzinfo == datetime.timezone.utc
 
     result = parse_datetime_string(json_format)
     assert result.year == 2018
@@ -57,7 +64,7 @@ def test_parse_datetime_string(mock_tz):
     assert result.hour == 23
     assert result.minute == 8
     assert result.second == 8
-    assert result.tzinfo == pytz.utc
+    assert result.tzinfo == datetime.timezone.utc
 
     result = parse_datetime_string(old_json_format)
     assert result.year == 2018
@@ -66,7 +73,7 @@ def test_parse_datetime_string(mock_tz):
     assert result.hour == 19
     assert result.minute == 8
     assert result.second == 8
-    assert result.tzinfo == pytz.utc
+    assert result.tzinfo == datetime.timezone.utc
 
     result = parse_datetime_string(splunk_format)
     assert result.year == 2015
@@ -75,4 +82,43 @@ def test_parse_datetime_string(mock_tz):
     assert result.hour == 14
     assert result.minute == 50
     assert result.second == 49
-    assert result.tzinfo == pytz.utc
+    assert result.tzinfo == datetime.timezone.utc
+
+
+@pytest.mark.parametrize(
+    "event_time,format",
+    [
+        ("2018-10-19 14:06:34 +0000", ace.time.event_time_format_tz),
+        ("2018-10-19 14:06:34 +0530", ace.time.event_time_format_tz),
+        ("2018-10-19 14:06:34 -0500", ace.time.event_time_format_tz),
+        ("2018-10-19T18:08:08.346118-0500", ace.time.event_time_format_json_tz),
+        ("2018-10-19T18:08:08.346+0130", ace.time.event_time_format_json_tz),
+        ("2018-10-19T18:08:08.0346+0000", ace.time.event_time_format_json_tz),
+        ("2015-02-19T09:50:49.000-05:00", ace.time.event_time_format_json_tz),
+        ("2015-02-19T09:50:49.123456+09:30", ace.time.event_time_format_json_tz),
+    ],
+)
+@pytest.mark.unit
+def test_parse_datetime_string_matches_strptime(event_time, format):
+    assert parse_datetime_string(event_time) == datetime.datetime.strptime(event_time, format)
+
+
+@pytest.mark.parametrize(
+    "event_time",
+    [
+        "",
+        "2018-10-19",
+        "2018-10-19 14:06:34 +00:00",
+        "2018-10-19T18:08:08-0500",
+    ],
+)
+@pytest.mark.unit
+def test_parse_datetime_string_invalid(event_time):
+    with pytest.raises(ValueError):
+        parse_datetime_string(event_time)
+
+
+@pytest.mark.unit
+def test_parse_datetime_string_shared_tzinfo():
+    assert ace.time._get_fixed_offset("-0500") is ace.time._get_fixed_offset("-05:00")
+    assert ace.time._get_fixed_offset("+0000") is datetime.timezone.utc
@@ -0,0 +1,32 @@
+# vim: ts=4:sw=4:et:cc=120
+#
+# pytest options need to be added in a conftest.py file that pytest loads when it starts
+#
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--system",
+        action="append",
+        choices=["database", "redis", "remote"],
+        help="only run the tests that use the system fixture against this type of system (can be used more than once)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    systems = config.getoption("--system")
+    if not systems:
+        return
+
+    selected = []
+    deselected = []
+    for item in items:
+        callspec = getattr(item, "callspec", None)
+        if callspec and callspec.params.get("system", systems[0]) not in systems:
+            deselected.append(item)
+        else:
+            selected.append(item)
+
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
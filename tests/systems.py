@@ -5,16 +5,17 @@
 # utility system definitions for testing
 #
 
+import dataclasses
 import os
 import os.path
 import tempfile
 import shutil
 
+from pathlib import Path
+
 from typing import Optional, Union, Any, Iterator
 
 from ace.analysis import RootAnalysis, AnalysisModuleType, Observable
-from ace.api import AceAPI
-from ace.api.remote import RemoteAceAPI
 from ace.crypto import initialize_encryption_settings, EncryptionSettings
 from ace.data_model import ContentMetadata
 from ace.logging import get_logger
@@ -26,26 +27,48 @@ from ace.system.remote import RemoteACESystem
 from ace.system.requests import AnalysisRequest
 from ace.system.threaded import ThreadedACESystem
 
-from httpx import AsyncClient
-import redislite
-from sqlalchemy import event
+from sqlalchemy import event, text
+from sqlalchemy.pool import StaticPool
+
+
+# the directory the test session keeps its files in (set by the test_data_dir fixture)
+# this is passed as an environment variable so that it also reaches the processes the tests start
+ENV_TEST_DATA_DIR = "ACE_TEST_DATA_DIR"
+
+
+def get_test_file_path(file_name: str) -> str:
+    """Returns the path to the given file in the directory the test session keeps its files in.
+    pytest-xdist workers each get their own directory so workers running in parallel do not share files."""
+    return os.path.join(os.environ[ENV_TEST_DATA_DIR], file_name)
+
+
+# key = password, value = EncryptionSettings with the aes key loaded
+_encryption_settings_cache = {}
 
 
-class ThreadedACETestSystem(ThreadedACESystem):
-    pass
+async def get_test_encryption_settings(password: str = "test") -> EncryptionSettings:
+    """Returns a copy of new encryption settings for the given password with the aes key already loaded.
+    The key derivation is slow so it is only done once per password."""
+    if password not in _encryption_settings_cache:
+        settings = await initialize_encryption_settings(password)
+        settings.load_aes_key(password)
+        _encryption_settings_cache[password] = settings
+
+    return dataclasses.replace(_encryption_settings_cache[password])
 
 
 class DatabaseACETestSystem(DatabaseACESystem, ThreadedACESystem):
 
-    # running the tests in memory works as long as the same db connection is
-    # always used
+    # the tests expect expired requests to be moved back into the queue on every request for work
+    expired_analysis_request_interval = 0
 
-    # db_url = "sqlite:///ace.db"
-    # db_url = "sqlite+aiosqlite://"
+    # running the tests in memory works as long as the same db connection is
+    # always used, so the StaticPool is used to share a single connection for the entire session
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs, storage_root=tempfile.mkdtemp())
         self.db_url = "sqlite+aiosqlite://"
+        self.db_kwargs = {"poolclass": StaticPool}
 
     async def initialize(self):
         await super().initialize()
@@ -56,22 +79,44 @@ class DatabaseACETestSystem(DatabaseACESystem, ThreadedACESystem):
             cursor.execute("PRAGMA foreign_keys=ON")
             cursor.close()
 
+    # set to True once the schema has been created
+    database_created = False
+
     async def reset(self):
         result = await super().reset()
 
+        # the schema only needs to be built once, after that we just clear out the data
+        if self.database_created:
+            await self.clear_database()
+        else:
+            await self.hard_reset()
+
+        # reset the storage_root
+        shutil.rmtree(self.storage_root)
+        self.storage_root = tempfile.mkdtemp()
+
+    async def hard_reset(self):
+        """Drops and rebuilds the entire database."""
         self.engine = None
 
         # remove the temporary file we used
-        if os.path.exists("ace.db"):
-            os.remove("ace.db")
+        Path("ace.db").unlink(missing_ok=True)
 
         # re-initialize and create the database
         await self.initialize()
         await self.create_database()
 
-        # reset the storage_root
-        shutil.rmtree(self.storage_root)
-        self.storage_root = tempfile.mkdtemp()
+    async def clear_database(self):
+        """Deletes all the data from the database without dropping the schema."""
+        from ace.system.database.schema import Base
+
+        async with self.engine.begin() as conn:
+            # some tests add triggers to the schema
+            for (name,) in (await conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'"))).all():
+                await conn.execute(text(f"DROP TRIGGER {name}"))
+
+            for table in reversed(Base.metadata.sorted_tables):
+                await conn.execute(table.delete())
 
     async def create_database(self):
         from ace.system.database.schema import Base
@@ -81,20 +126,22 @@ class DatabaseACETestSystem(DatabaseACESystem, ThreadedACESystem):
         async with self.engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
+        self.database_created = True
+
     async def stop(self):
         await super().stop()
 
-        if os.path.exists("ace.db"):
-            os.remove("ace.db")
+        Path("ace.db").unlink(missing_ok=True)
 
 
 class RedisACETestSystem(RedisACESystem, DatabaseACETestSystem, ThreadedACESystem):
     async def reset(self):
         await super().reset()
 
-        # clear everything
+        # clear everything (the tests only use the selected database)
+        # the keys are gone right away, the memory is freed in the background
         async with self.get_redis_connection() as rc:
-            await rc.flushall()
+            await rc.flushdb(async_op=True)
 
     async def stop(self):
         await self.close_redis_connections()
@@ -106,13 +153,15 @@ class RedisACETestSystem(RedisACESystem, DatabaseACETestSystem, ThreadedACESyste
 class DistributedACETestSystem(RedisACETestSystem):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.db_url = "sqlite+aiosqlite:///ace_distributed.db"
+        self.db_path = get_test_file_path("ace_distributed.db")
+        self.db_url = f"sqlite+aiosqlite:///{self.db_path}"
+        # the file based database is shared by concurrent api calls so it uses the default pool
+        self.db_kwargs = {}
 
-    async def reset(self):
-        if os.path.exists("ace_distributed.db"):
-            os.remove("ace_distributed.db")
+    async def hard_reset(self):
+        Path(self.db_path).unlink(missing_ok=True)
 
-        await super().reset()
+        await super().hard_reset()
 
 
 class RemoteACETestSystem(RemoteACESystem):
@@ -164,7 +213,7 @@ class RemoteACETestSystem(RemoteACESystem):
         return await app.state.system.add_work_queue(amt)
 
     async def put_work(self, amt: Union[AnalysisModuleType, str], analysis_request: AnalysisRequest):
-        return await app.state.system.put_work(amt)
+        return await app.state.system.put_work(amt, analysis_request)
 
     async def get_work(self, amt: Union[AnalysisModuleType, str], timeout: int) -> Union[AnalysisRequest, None]:
         return await app.state.system.get_work(amt, timeout)
@@ -303,7 +352,9 @@ class RemoteACETestSystemProcess(RemoteACESystem):
         #
 
         app.state.system.encryption_settings = self.existing_encryption_settings
-        app.state.system.encryption_settings.load_aes_key("test")
+        # the settings come from get_test_encryption_settings so the aes key is already loaded
+        if app.state.system.encryption_settings.aes_key is None:
+            app.state.system.encryption_settings.load_aes_key("test")
         app.state.system.root_api_key = self.api.api_key
 
         await app.state.system.initialize()